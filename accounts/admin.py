@@ -131,6 +131,7 @@ class UserSessionAdmin(admin.ModelAdmin):
     Admin interface for UserSession model.
     """
     list_display = ['user', 'ip_address', 'created_at', 'last_activity', 'is_active']
+    list_select_related = ['user']
     list_filter = ['is_active', 'created_at']
     search_fields = ['user__email', 'ip_address']
     readonly_fields = ['user', 'session_key', 'ip_address', 'user_agent', 'created_at']
@@ -155,6 +156,7 @@ class AzureADSettingsAdmin(admin.ModelAdmin):
     Admin interface for Azure AD Settings.
     """
     list_display = ['enabled', 'sync_enabled', 'connection_status', 'last_test_date', 'updated_at']
+    list_select_related = ['updated_by']
     readonly_fields = ['connection_status', 'last_test_date', 'test_error_message', 'last_automatic_sync', 'created_at', 'updated_at', 'updated_by']
     
     fieldsets = (
@@ -199,7 +201,7 @@ class AzureADSettingsAdmin(admin.ModelAdmin):
                 settings.connection_status = 'testing'
                 settings.save()
                 
-                success, result = azure_ad_service.test_connection()
+                success, result = azure_ad_service.test_connection(use_cache=False)
                 
                 if success:
                     settings.connection_status = 'connected'
@@ -161,7 +161,7 @@ def remove_azure_ad_link(modeladmin, request, queryset):
 def test_azure_ad_connection(modeladmin, request, queryset):
     """Test the Azure AD connection."""
     
-    success, result = azure_ad_service.test_connection()
+    success, result = azure_ad_service.test_connection(use_cache=False)
     
     if success:
         messages.success(request, f"✅ Azure AD connection successful: {result.get('message', 'Connected')}")
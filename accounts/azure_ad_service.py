@@ -5,6 +5,7 @@ This service handles bidirectional synchronization between the HRIS platform
 and Azure AD using the Microsoft Graph API.
 """
 
+import hashlib
 import logging
 import secrets
 import string
@@ -12,6 +13,7 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone as django_timezone
 from msal import ConfidentialClientApplication
 import requests
@@ -20,6 +22,29 @@ from .models import User
 
 logger = logging.getLogger(__name__)
 
+# How long a connection test result is reused before hitting Graph again
+TEST_CONNECTION_CACHE_TIMEOUT = 30
+
+# Access tokens are reused until this many seconds before they expire
+ACCESS_TOKEN_EXPIRY_MARGIN = 300
+
+
+def _credentials_key(azure_settings) -> str:
+    """
+    Hash every setting that affects token acquisition, for use in cache keys.
+    
+    Rotating the secret or changing the authority or scope then moves to a
+    new key instead of reusing a token issued for the old credentials.
+    """
+    raw = '\0'.join([
+        azure_settings.tenant_id or '',
+        azure_settings.client_id or '',
+        azure_settings.client_secret or '',
+        azure_settings.authority_url or '',
+        azure_settings.scope or '',
+    ])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
 
 class AzureADService:
     """
@@ -56,11 +81,23 @@ class AzureADService:
         azure_settings = self._get_settings()
         return azure_settings.is_configured
     
-    def _get_access_token(self) -> Optional[str]:
+    def _get_access_token(self, force_refresh: bool = False) -> Optional[str]:
         """
         Get access token for Microsoft Graph API.
+        
+        Args:
+            force_refresh: Acquire a new token from Azure AD even if one is cached
         """
         azure_settings = self._get_settings()
+        
+        # The MSAL app is rebuilt per call, so its in-memory token cache never
+        # survives between requests; share tokens across workers instead
+        cache_key = f"azure_ad_access_token:{_credentials_key(azure_settings)}"
+        if not force_refresh:
+            token = cache.get(cache_key)
+            if token:
+                return token
+        
         app = self._initialize_app(azure_settings)
         
         if not app:
@@ -74,6 +111,9 @@ class AzureADService:
                 result = app.acquire_token_for_client(scopes=scope)
             
             if "access_token" in result:
+                timeout = int(result.get("expires_in", 0)) - ACCESS_TOKEN_EXPIRY_MARGIN
+                if timeout > 0:
+                    cache.set(cache_key, result["access_token"], timeout)
                 return result["access_token"]
             else:
                 logger.error(f"Failed to acquire token: {result.get('error_description')}")
@@ -230,7 +270,7 @@ class AzureADService:
             user.azure_ad_sync_status = "synced"
             user.azure_ad_last_sync = django_timezone.now()
             user.azure_ad_sync_error = ""  # Clear any previous errors
-            user.save()
+            user.save(update_fields=['azure_ad_object_id', 'azure_ad_sync_status', 'azure_ad_last_sync', 'azure_ad_sync_error'])
             
             logger.info(f"Successfully created Azure AD user for {user.email}")
             return True, {
@@ -243,7 +283,7 @@ class AzureADService:
             user.azure_ad_sync_status = "failed"
             error_message = f"{result.get('error', 'Unknown error')}: {result.get('details', 'No details available')}"
             user.azure_ad_sync_error = error_message
-            user.save()
+            user.save(update_fields=['azure_ad_sync_status', 'azure_ad_sync_error'])
             
             logger.error(f"Failed to create Azure AD user for {user.email}: {result}")
             return False, result
@@ -337,7 +377,7 @@ class AzureADService:
             user.azure_ad_sync_status = "synced"
             user.azure_ad_last_sync = django_timezone.now()
             user.azure_ad_sync_error = ""  # Clear any previous errors
-            user.save()
+            user.save(update_fields=['azure_ad_sync_status', 'azure_ad_last_sync', 'azure_ad_sync_error'])
             
             logger.info(f"Successfully updated Azure AD user for {user.email}")
             return True, {"message": "User updated successfully in Azure AD"}
@@ -345,7 +385,7 @@ class AzureADService:
             user.azure_ad_sync_status = "failed"
             error_message = f"{result.get('error', 'Unknown error')}: {result.get('details', 'No details available')}"
             user.azure_ad_sync_error = error_message
-            user.save()
+            user.save(update_fields=['azure_ad_sync_status', 'azure_ad_sync_error'])
             
             logger.error(f"Failed to update Azure AD user for {user.email}: {result}")
             return False, result
@@ -374,13 +414,13 @@ class AzureADService:
         if success:
             user.azure_ad_sync_status = "synced"
             user.azure_ad_last_sync = django_timezone.now()
-            user.save()
+            user.save(update_fields=['azure_ad_sync_status', 'azure_ad_last_sync'])
             
             logger.info(f"Successfully disabled Azure AD user for {user.email}")
             return True, {"message": "User disabled successfully in Azure AD"}
         else:
             user.azure_ad_sync_status = "failed"
-            user.save()
+            user.save(update_fields=['azure_ad_sync_status'])
             
             logger.error(f"Failed to disable Azure AD user for {user.email}: {result}")
             return False, result
@@ -410,13 +450,13 @@ class AzureADService:
             user.azure_ad_object_id = None
             user.azure_ad_sync_status = "disabled"
             user.azure_ad_last_sync = django_timezone.now()
-            user.save()
+            user.save(update_fields=['azure_ad_object_id', 'azure_ad_sync_status', 'azure_ad_last_sync'])
             
             logger.info(f"Successfully deleted Azure AD user for {user.email}")
             return True, {"message": "User deleted successfully from Azure AD"}
         else:
             user.azure_ad_sync_status = "failed"
-            user.save()
+            user.save(update_fields=['azure_ad_sync_status'])
             
             logger.error(f"Failed to delete Azure AD user for {user.email}: {result}")
             return False, result
@@ -460,9 +500,12 @@ class AzureADService:
             # User doesn't exist, create it
             return self.create_user(user)
     
-    def test_connection(self) -> Tuple[bool, Dict]:
+    def test_connection(self, use_cache: bool = True) -> Tuple[bool, Dict]:
         """
         Test the connection to Microsoft Graph API.
+        
+        Results are cached briefly per credential set so repeated checks do not
+        each make a round trip to Graph. Pass use_cache=False to force a live test.
         """
         azure_settings = self._get_settings()
         
@@ -472,9 +515,23 @@ class AzureADService:
                 "details": "Please configure tenant ID, client ID, and client secret"
             }
         
-        # Test token acquisition first
+        cache_key = f"azure_ad_test_connection:{_credentials_key(azure_settings)}"
+        if use_cache:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        outcome = self._test_connection(azure_settings)
+        cache.set(cache_key, outcome, TEST_CONNECTION_CACHE_TIMEOUT)
+        return outcome
+    
+    def _test_connection(self, azure_settings) -> Tuple[bool, Dict]:
+        """
+        Run a live connection test against Microsoft Graph API.
+        """
+        # Test token acquisition first, against Azure AD rather than the cache
         try:
-            token = self._get_access_token()
+            token = self._get_access_token(force_refresh=True)
             if not token:
                 return False, {
                     "error": "Failed to acquire access token",
@@ -12,6 +12,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from django.conf import settings
+from django.utils import timezone
 
 from .models import User
 from .azure_ad_service import azure_ad_service
@@ -69,13 +70,15 @@ def sync_user_to_azure(request, user_id):
         )
     
     try:
+        # Mark the sync pending before queueing it, so a fast worker's
+        # result is not overwritten
+        user.azure_ad_sync_status = 'pending'
+        user.azure_ad_sync_started_at = timezone.now()
+        user.save(update_fields=['azure_ad_sync_status', 'azure_ad_sync_started_at'])
+        
         # Queue the sync task
         task = sync_user_to_azure_ad.delay(user_id, action)
         
-        # Update user sync status
-        user.azure_ad_sync_status = 'pending'
-        user.save()
-        
         logger.info(f"Queued Azure AD sync for user {user.email} (action: {action})")
         
         return Response({
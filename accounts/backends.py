@@ -0,0 +1,34 @@
+"""
+Authentication backends for the HRIS platform.
+
+This module provides a model backend that loads a reduced set of user columns
+when restoring the user attached to a session.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class SlimUserModelBackend(ModelBackend):
+    """
+    Model backend that restores session users with only the columns needed
+    for authentication and role-based permission checks.
+    
+    Credential checks in authenticate() still load the full row, since the
+    login response serializes the complete profile.
+    """
+    
+    # password is required to verify the session auth hash
+    SESSION_USER_FIELDS = (
+        'id', 'password', 'email', 'first_name', 'last_name', 'role',
+        'department_id', 'is_active', 'is_staff', 'is_superuser', 'last_login',
+    )
+    
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.only(*self.SESSION_USER_FIELDS).get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
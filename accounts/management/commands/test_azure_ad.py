@@ -23,13 +23,22 @@ class Command(BaseCommand):
             action='store_true',
             help='Update the connection status in the database',
         )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Bypass the cached result and run a live connection test',
+        )
 
     def handle(self, *args, **options):
         self.stdout.write("🔍 Testing Azure AD Connection...")
         self.stdout.write("=" * 50)
         
-        # Get current settings
-        settings = AzureADSettings.get_settings()
+        # Get current settings; the cached instance is shared and only partly
+        # loaded, so load the full row when the status will be written back
+        if options['update_status']:
+            settings = AzureADSettings.get_full_settings()
+        else:
+            settings = AzureADSettings.get_settings()
         
         # Display current configuration
         self.stdout.write(f"✅ Configuration Status:")
@@ -52,7 +61,7 @@ class Command(BaseCommand):
         
         # Test the connection
         self.stdout.write("🔄 Testing connection to Microsoft Graph API...")
-        success, result = azure_ad_service.test_connection()
+        success, result = azure_ad_service.test_connection(use_cache=not options['force'])
         
         if success:
             self.stdout.write(self.style.SUCCESS("✅ Connection successful!"))
@@ -75,13 +84,16 @@ class Command(BaseCommand):
                 self.stdout.write("✅ Updated connection status in database")
                 
         else:
+            error = result.get('error', '')
+            details = result.get('details', '')
+            troubleshooting = result.get('troubleshooting')
+            
             self.stdout.write(self.style.ERROR("❌ Connection failed!"))
-            self.stdout.write(f"Error: {result.get('error', 'Unknown error')}")
-            self.stdout.write(f"Details: {result.get('details', 'No details available')}")
+            self.stdout.write(f"Error: {error or 'Unknown error'}")
+            self.stdout.write(f"Details: {details or 'No details available'}")
             
-            if 'troubleshooting' in result:
+            if troubleshooting:
                 self.stdout.write("\n🔧 Troubleshooting Information:")
-                troubleshooting = result['troubleshooting']
                 for key, value in troubleshooting.items():
                     self.stdout.write(f"   {key.replace('_', ' ').title()}: {value}")
             
@@ -104,7 +116,7 @@ class Command(BaseCommand):
             if options['update_status']:
                 settings.connection_status = 'failed'
                 settings.last_test_date = timezone.now()
-                settings.test_error_message = f"{result.get('error', '')}: {result.get('details', '')}"
+                settings.test_error_message = f"{error}: {details}"
                 settings.save()
                 self.stdout.write("✅ Updated connection status in database")
         
@@ -1,13 +1,16 @@
 """
-Custom user manager for the HRIS platform.
+Custom managers for the HRIS platform.
 
 This module provides a custom user manager that works with email-based authentication
-instead of username-based authentication.
+instead of username-based authentication, plus querysets for related account models.
 """
 
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import BaseUserManager
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
+from django.db import models, transaction
+from django.utils import timezone
 
 
 class UserManager(BaseUserManager):
@@ -15,6 +18,7 @@ class UserManager(BaseUserManager):
     Custom user manager for User model with email as the unique identifier.
     """
     
+    @transaction.atomic
     def _create_user(self, email, password, **extra_fields):
         """
         Create and save a user with the given email and password.
@@ -47,15 +51,15 @@ class UserManager(BaseUserManager):
         """
         Create and save a superuser with the given email and password.
         """
+        if extra_fields.get('is_staff', True) is not True:
+            raise ValueError('Superuser must have is_staff=True.')
+        if extra_fields.get('is_superuser', True) is not True:
+            raise ValueError('Superuser must have is_superuser=True.')
+        
         extra_fields.setdefault('is_staff', True)
         extra_fields.setdefault('is_superuser', True)
         extra_fields.setdefault('role', 'admin')
         
-        if extra_fields.get('is_staff') is not True:
-            raise ValueError('Superuser must have is_staff=True.')
-        if extra_fields.get('is_superuser') is not True:
-            raise ValueError('Superuser must have is_superuser=True.')
-        
         return self._create_user(email, password, **extra_fields)
     
     def create_hr_manager(self, email, password=None, **extra_fields):
@@ -83,32 +87,100 @@ class UserManager(BaseUserManager):
         
         return self._create_user(email, password, **extra_fields)
     
+    def create_users_bulk(self, users, batch_size=500):
+        """
+        Create many users at once (e.g. when importing from Azure AD).
+        
+        Each item in ``users`` is a dict of field values that must include
+        ``email`` and may include ``password``. Passwords are hashed up front
+        and rows are inserted with one INSERT per batch inside a single
+        transaction.
+        """
+        objs = []
+        for user_data in users:
+            extra_fields = dict(user_data)
+            email = extra_fields.pop('email', None)
+            password = extra_fields.pop('password', None)
+            
+            if not email:
+                raise ValueError('The Email field must be set')
+            
+            try:
+                validate_email(email)
+            except ValidationError:
+                raise ValueError(f'Invalid email address: {email}')
+            
+            extra_fields.setdefault('role', 'employee')
+            objs.append(self.model(
+                email=self.normalize_email(email),
+                password=make_password(password),
+                **extra_fields
+            ))
+        
+        with transaction.atomic(using=self._db):
+            return self.bulk_create(objs, batch_size=batch_size)
+    
     def get_by_natural_key(self, email):
         """
         Retrieve user by email (natural key).
         """
         return self.get(email__iexact=email)
     
+    def slim(self):
+        """
+        Return queryset that only loads the columns needed for user listings.
+        """
+        return self.get_queryset().only(
+            'id', 'email', 'is_active', 'role', 'first_name', 'last_name',
+            'department_id', 'job_title_id'
+        )
+    
+    def with_relations(self):
+        """
+        Return queryset with department, job title and manager joined in.
+        """
+        return self.get_queryset().select_related('department', 'job_title', 'manager')
+    
     def active_users(self):
         """
         Return queryset of active users.
         """
-        return self.filter(is_active=True)
+        return self.with_relations().filter(is_active=True)
     
     def by_role(self, role):
         """
         Return queryset of users by role.
         """
-        return self.filter(role=role)
+        return self.with_relations().filter(role=role)
     
     def staff_users(self):
         """
         Return queryset of staff users (admins and HR managers).
         """
-        return self.filter(role__in=['admin', 'hr_manager'])
+        Role = self.model.Role
+        return self.with_relations().filter(role__in=[Role.ADMIN, Role.HR_MANAGER])
     
     def managers(self):
         """
         Return queryset of all managers (HR and hiring managers).
         """
-        return self.filter(role__in=['hr_manager', 'hiring_manager'])
\ No newline at end of file
+        Role = self.model.Role
+        return self.with_relations().filter(role__in=[Role.HR_MANAGER, Role.HIRING_MANAGER])
+
+
+class PasswordResetTokenQuerySet(models.QuerySet):
+    """
+    QuerySet for PasswordResetToken with expiry filters evaluated in the database.
+    """
+    
+    def expired(self):
+        """
+        Return tokens whose expiry time has passed.
+        """
+        return self.filter(expires_at__lt=timezone.now())
+    
+    def active(self):
+        """
+        Return unused tokens that have not expired yet.
+        """
+        return self.filter(is_used=False, expires_at__gte=timezone.now())
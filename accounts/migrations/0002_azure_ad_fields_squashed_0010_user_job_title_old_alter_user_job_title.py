@@ -0,0 +1,164 @@
+# Squashed from 0002_azure_ad_fields through 0010_user_job_title_old_alter_user_job_title
+#
+# Hand-optimized: RenameIndex operations are folded into AddIndex with the final
+# names, AzureADSettings is created with the automatic sync fields from 0009, and
+# the manager FK is added with its final limit_choices_to so each column is only
+# touched once on a fresh database.
+
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    replaces = [
+        ('accounts', '0002_azure_ad_fields'),
+        ('accounts', '0003_rename_users_azure_ad_object_id_idx_users_azure_a_45f756_idx_and_more'),
+        ('accounts', '0004_add_azure_ad_sync_error'),
+        ('accounts', '0005_user_company_name_user_employee_id_and_more'),
+        ('accounts', '0007_add_business_email_field'),
+        ('accounts', '0008_add_is_manager_field'),
+        ('accounts', '0009_add_automatic_sync_fields'),
+        ('accounts', '0010_user_job_title_old_alter_user_job_title'),
+    ]
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('employees', '0004_employeeprofile_job_title_old_jobtitle_and_more'),
+    ]
+
+    operations = [
+        # Azure AD sync tracking
+        migrations.AddField(
+            model_name='user',
+            name='azure_ad_object_id',
+            field=models.CharField(blank=True, help_text='Azure AD Object ID for Microsoft Graph API integration', max_length=36, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='azure_ad_sync_enabled',
+            field=models.BooleanField(default=True, help_text='Enable automatic sync with Azure AD'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='azure_ad_last_sync',
+            field=models.DateTimeField(blank=True, help_text='Last successful sync with Azure AD', null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='azure_ad_sync_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('synced', 'Synced'), ('failed', 'Failed'), ('disabled', 'Disabled')], default='pending', help_text='Current Azure AD sync status', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='azure_ad_sync_error',
+            field=models.TextField(blank=True, help_text='Last sync error message for troubleshooting'),
+        ),
+        migrations.CreateModel(
+            name='AzureADSettings',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('enabled', models.BooleanField(default=False, help_text='Enable Azure AD integration')),
+                ('tenant_id', models.CharField(blank=True, help_text='Azure AD Tenant ID (Directory ID)', max_length=100)),
+                ('client_id', models.CharField(blank=True, help_text='Azure AD Application (Client) ID', max_length=100)),
+                ('client_secret', models.CharField(blank=True, help_text='Azure AD Client Secret', max_length=500)),
+                ('sync_enabled', models.BooleanField(default=False, help_text='Enable automatic user synchronization')),
+                ('sync_on_user_create', models.BooleanField(default=True, help_text='Automatically sync new users to Azure AD')),
+                ('sync_on_user_update', models.BooleanField(default=True, help_text='Automatically sync user updates to Azure AD')),
+                ('sync_on_user_disable', models.BooleanField(default=True, help_text='Automatically disable users in Azure AD when deactivated')),
+                ('authority', models.URLField(default='https://login.microsoftonline.com/', help_text='Azure AD Authority URL')),
+                ('scope', models.CharField(default='https://graph.microsoft.com/.default', help_text='Microsoft Graph API scope', max_length=200)),
+                ('default_password_length', models.PositiveIntegerField(default=12, help_text='Default password length for new Azure AD users')),
+                ('connection_status', models.CharField(choices=[('unknown', 'Unknown'), ('connected', 'Connected'), ('failed', 'Failed'), ('testing', 'Testing')], default='unknown', help_text='Last connection test result', max_length=20)),
+                ('last_test_date', models.DateTimeField(blank=True, help_text='Last time connection was tested', null=True)),
+                ('test_error_message', models.TextField(blank=True, help_text='Error message from last failed test')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('updated_by', models.ForeignKey(blank=True, help_text='User who last updated these settings', null=True, on_delete=django.db.models.deletion.SET_NULL, to='accounts.user')),
+                ('enable_automatic_sync', models.BooleanField(default=False, help_text='Enable automatic periodic synchronization of all users')),
+                ('last_automatic_sync', models.DateTimeField(blank=True, help_text='Last time automatic sync was performed', null=True)),
+                ('sync_interval_hours', models.PositiveIntegerField(default=24, help_text='Interval in hours between automatic sync operations')),
+            ],
+            options={
+                'verbose_name': 'Azure AD Settings',
+                'verbose_name_plural': 'Azure AD Settings',
+                'db_table': 'azure_ad_settings',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['azure_ad_object_id'], name='users_azure_a_45f756_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['azure_ad_sync_status'], name='users_azure_a_4997d2_idx'),
+        ),
+
+        # Employee details for Azure AD sync
+        migrations.AddField(
+            model_name='user',
+            name='company_name',
+            field=models.CharField(blank=True, help_text='Company or organization name', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='employee_id',
+            field=models.CharField(blank=True, help_text='Unique employee identifier', max_length=50, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='employee_type',
+            field=models.CharField(blank=True, choices=[('full_time', 'Full Time'), ('part_time', 'Part Time'), ('contractor', 'Contractor'), ('intern', 'Intern'), ('temporary', 'Temporary')], help_text='Employment type', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='hire_date',
+            field=models.DateField(blank=True, help_text='Employee hire date', null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='office_location',
+            field=models.CharField(blank=True, help_text='Primary office or work location', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='is_manager',
+            field=models.BooleanField(default=False, help_text='Designates whether this user can be assigned as a manager to other users'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='manager',
+            field=models.ForeignKey(blank=True, help_text='Direct manager or supervisor', limit_choices_to={'is_active': True, 'is_manager': True}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='user_direct_reports', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='department',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='users', to='employees.department'),
+        ),
+
+        # Business email / UPN split
+        migrations.AddField(
+            model_name='user',
+            name='business_email',
+            field=models.EmailField(blank=True, help_text='Business email address (populates Azure AD email property)', max_length=254, validators=[django.core.validators.EmailValidator()]),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='email',
+            field=models.EmailField(help_text='Username/UPN for login and Azure AD User Principal Name', max_length=254, unique=True, validators=[django.core.validators.EmailValidator()]),
+        ),
+
+        # Job title FK conversion
+        migrations.AddField(
+            model_name='user',
+            name='job_title_old',
+            field=models.CharField(blank=True, help_text='Temporary field for migration', max_length=100, null=True),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='job_title',
+            field=models.ForeignKey(blank=True, help_text='User job title/position', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='users', to='employees.jobtitle'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_azure_ad_fields_squashed_0010_user_job_title_old_alter_user_job_title'),
+    ]
+
+    operations = [
+        # azure_ad_object_id is unique, so its unique index already serves lookups
+        migrations.RemoveIndex(
+            model_name='user',
+            name='users_azure_a_45f756_idx',
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('azure_ad_sync_enabled', True)), fields=['azure_ad_sync_status', 'azure_ad_last_sync'], name='users_sync_status_last_idx'),
+        ),
+    ]
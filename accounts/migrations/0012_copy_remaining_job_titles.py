@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-16 09:40
+
+from django.db import migrations
+
+
+def copy_remaining_job_titles(apps, schema_editor):
+    """
+    Link any user still carrying only a legacy text job title to a JobTitle
+    record so the value is not lost when job_title_old is dropped.
+    """
+    User = apps.get_model('accounts', 'User')
+    JobTitle = apps.get_model('employees', 'JobTitle')
+
+    pending = (
+        User.objects.filter(job_title__isnull=True, job_title_old__isnull=False)
+        .exclude(job_title_old='')
+        .values_list('id', 'job_title_old')
+    )
+    for user_id, title in pending:
+        title = title.strip()
+        if not title:
+            continue
+        job_title, _ = JobTitle.objects.get_or_create(
+            title=title,
+            defaults={'description': 'Migrated from existing data', 'is_active': True}
+        )
+        User.objects.filter(id=user_id).update(job_title=job_title)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0004_employeeprofile_job_title_old_jobtitle_and_more'),
+        ('accounts', '0011_user_sync_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_remaining_job_titles, migrations.RunPython.noop),
+    ]
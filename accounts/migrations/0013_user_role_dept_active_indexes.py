@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-16 10:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_copy_remaining_job_titles'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='user',
+            name='users_role_0ace22_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='users_is_acti_847b48_idx',
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'is_active'], name='users_role_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['department', 'is_active'], name='users_dept_active_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-16 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0013_user_role_dept_active_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='passwordresettoken',
+            index=models.Index(fields=['is_used', 'expires_at'], name='pw_reset_used_expires_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-16 11:34
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0014_passwordresettoken_used_expires_idx'),
+    ]
+
+    operations = [
+        # email is unique=True, so the database already maintains an index for it
+        migrations.RemoveIndex(
+            model_name='user',
+            name='users_email_4b85f2_idx',
+        ),
+    ]
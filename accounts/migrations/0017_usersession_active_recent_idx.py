@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-16 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0016_remove_user_email_idx'),
+    ]
+
+    operations = [
+        # (user, is_active) is a prefix of the new index, so it is replaced
+        migrations.RemoveIndex(
+            model_name='usersession',
+            name='user_sessio_user_id_bb1b83_idx',
+        ),
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['user', 'is_active', '-last_activity'], name='usess_user_active_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-16 14:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0017_usersession_active_recent_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='azure_ad_sync_started_at',
+            field=models.DateTimeField(blank=True, help_text='When the current Azure AD sync was queued', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('azure_ad_sync_status', 'pending')), fields=['azure_ad_sync_started_at'], name='users_sync_started_pend_idx'),
+        ),
+    ]
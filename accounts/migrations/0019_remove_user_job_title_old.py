@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    # Kept apart from 0012_copy_remaining_job_titles: the ALTER TABLE cannot
+    # run in the transaction that updated the deferrable job_title FK
+
+    dependencies = [
+        ('accounts', '0018_user_azure_ad_sync_started_at'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='user',
+            name='job_title_old',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0019_remove_user_job_title_old'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='passwordresettoken',
+            index=models.Index(fields=['expires_at'], name='pw_reset_expires_idx'),
+        ),
+    ]
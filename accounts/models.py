@@ -9,12 +9,18 @@ This module defines a custom User model with predefined roles for the HRIS + ATS
 - Candidate: Limited access for application tracking
 """
 
+import time
+
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.db import models
 from django.utils import timezone
 from django.core.validators import EmailValidator
 from django.core.cache import cache
-from .managers import UserManager
+from .managers import PasswordResetTokenQuerySet, UserManager
+
+
+# Shared by the email fields; EmailValidator is stateless once constructed
+_EMAIL_VALIDATOR = EmailValidator()
 
 
 class User(AbstractBaseUser, PermissionsMixin):
@@ -32,12 +38,12 @@ class User(AbstractBaseUser, PermissionsMixin):
     # Core user fields
     email = models.EmailField(
         unique=True,
-        validators=[EmailValidator()],
+        validators=[_EMAIL_VALIDATOR],
         help_text='Username/UPN for login and Azure AD User Principal Name'
     )
     business_email = models.EmailField(
         blank=True,
-        validators=[EmailValidator()],
+        validators=[_EMAIL_VALIDATOR],
         help_text='Business email address (populates Azure AD email property)'
     )
     first_name = models.CharField(max_length=150, blank=True)
@@ -89,7 +95,6 @@ class User(AbstractBaseUser, PermissionsMixin):
         related_name='users',
         help_text='User job title/position'
     )
-    job_title_old = models.CharField(max_length=100, blank=True, null=True, help_text='Temporary field for migration')
     
     # Additional employee information for Azure AD sync
     company_name = models.CharField(max_length=100, blank=True, help_text='Company or organization name')
@@ -154,6 +159,11 @@ class User(AbstractBaseUser, PermissionsMixin):
         blank=True,
         help_text='Last sync error message for troubleshooting'
     )
+    azure_ad_sync_started_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text='When the current Azure AD sync was queued'
+    )
     
     # Manager for custom user operations
     objects = UserManager()
@@ -166,11 +176,19 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         indexes = [
-            models.Index(fields=['email']),
-            models.Index(fields=['role']),
-            models.Index(fields=['is_active']),
-            models.Index(fields=['azure_ad_object_id']),
+            models.Index(fields=['role', 'is_active'], name='users_role_active_idx'),
+            models.Index(fields=['department', 'is_active'], name='users_dept_active_idx'),
             models.Index(fields=['azure_ad_sync_status']),
+            models.Index(
+                fields=['azure_ad_sync_status', 'azure_ad_last_sync'],
+                name='users_sync_status_last_idx',
+                condition=models.Q(azure_ad_sync_enabled=True),
+            ),
+            models.Index(
+                fields=['azure_ad_sync_started_at'],
+                name='users_sync_started_pend_idx',
+                condition=models.Q(azure_ad_sync_status='pending'),
+            ),
         ]
     
     def __str__(self):
@@ -214,30 +232,33 @@ class User(AbstractBaseUser, PermissionsMixin):
         Check if user has specific permission based on role.
         This method can be extended for fine-grained permissions.
         """
-        permission_map = {
-            self.Role.ADMIN: ['all'],
-            self.Role.HR_MANAGER: [
-                'view_all_employees', 'manage_employees', 'view_all_jobs',
-                'manage_jobs', 'view_all_applicants', 'manage_applicants',
-                'schedule_interviews', 'view_reports'
-            ],
-            self.Role.HIRING_MANAGER: [
-                'view_department_employees', 'view_department_jobs',
-                'manage_department_jobs', 'view_department_applicants',
-                'manage_department_applicants', 'schedule_interviews'
-            ],
-            self.Role.EMPLOYEE: [
-                'view_own_profile', 'update_own_profile', 'view_company_jobs'
-            ],
-            self.Role.CANDIDATE: [
-                'view_own_applications', 'apply_to_jobs', 'view_application_status'
-            ]
-        }
-        
-        user_permissions = permission_map.get(self.role, [])
+        user_permissions = _ROLE_PERMISSIONS.get(self.role, _NO_PERMISSIONS)
         return 'all' in user_permissions or permission in user_permissions
 
 
+# Role -> permission lookup table used by User.has_permission()
+_NO_PERMISSIONS = frozenset()
+_ROLE_PERMISSIONS = {
+    User.Role.ADMIN: frozenset({'all'}),
+    User.Role.HR_MANAGER: frozenset({
+        'view_all_employees', 'manage_employees', 'view_all_jobs',
+        'manage_jobs', 'view_all_applicants', 'manage_applicants',
+        'schedule_interviews', 'view_reports'
+    }),
+    User.Role.HIRING_MANAGER: frozenset({
+        'view_department_employees', 'view_department_jobs',
+        'manage_department_jobs', 'view_department_applicants',
+        'manage_department_applicants', 'schedule_interviews'
+    }),
+    User.Role.EMPLOYEE: frozenset({
+        'view_own_profile', 'update_own_profile', 'view_company_jobs'
+    }),
+    User.Role.CANDIDATE: frozenset({
+        'view_own_applications', 'apply_to_jobs', 'view_application_status'
+    }),
+}
+
+
 class UserSession(models.Model):
     """
     Track user sessions for security and analytics.
@@ -255,7 +276,7 @@ class UserSession(models.Model):
         verbose_name = 'User Session'
         verbose_name_plural = 'User Sessions'
         indexes = [
-            models.Index(fields=['user', 'is_active']),
+            models.Index(fields=['user', 'is_active', '-last_activity'], name='usess_user_active_recent_idx'),
             models.Index(fields=['session_key']),
         ]
     
@@ -273,19 +294,45 @@ class PasswordResetToken(models.Model):
     expires_at = models.DateTimeField()
     is_used = models.BooleanField(default=False)
     
+    objects = PasswordResetTokenQuerySet.as_manager()
+    
     class Meta:
         db_table = 'password_reset_tokens'
         verbose_name = 'Password Reset Token'
         verbose_name_plural = 'Password Reset Tokens'
+        indexes = [
+            # active(): unused tokens that have not expired
+            models.Index(fields=['is_used', 'expires_at'], name='pw_reset_used_expires_idx'),
+            # expired(): periodic cleanup_expired_password_reset_tokens
+            models.Index(fields=['expires_at'], name='pw_reset_expires_idx'),
+        ]
     
     def __str__(self):
         return f"Reset token for {self.user.email}"
     
     def is_expired(self):
-        """Check if the token has expired."""
+        """
+        Check if the token has expired.
+        
+        Use PasswordResetToken.objects.expired() to filter many tokens at once.
+        """
         return timezone.now() > self.expires_at
 
 
+# Per-process cache for AzureADSettings.get_settings(), in seconds
+LOCAL_SETTINGS_CACHE_TTL = 30
+_local_settings_cache = {'value': None, 'expires': 0.0}
+
+# Shared cache entries are stored under a versioned key; saving bumps the version
+SETTINGS_CACHE_VERSION_KEY = 'azure_ad_settings:v'
+SETTINGS_CACHE_TIMEOUT = 300
+
+
+def _settings_cache_key():
+    """Return the shared cache key for the current settings version."""
+    return f"azure_ad_settings:{cache.get(SETTINGS_CACHE_VERSION_KEY, 0)}"
+
+
 class AzureADSettings(models.Model):
     """
     Dynamic Azure AD configuration settings that can be managed through the admin panel.
@@ -393,6 +440,13 @@ class AzureADSettings(models.Model):
         help_text='User who last updated these settings'
     )
     
+    # Columns needed by the sync service; get_settings() loads only these
+    SYNC_CONFIG_FIELDS = (
+        'id', 'enabled', 'tenant_id', 'client_id', 'client_secret',
+        'sync_enabled', 'sync_on_user_create', 'sync_on_user_update',
+        'sync_on_user_disable', 'authority', 'scope', 'default_password_length',
+    )
+    
     class Meta:
         db_table = 'azure_ad_settings'
         verbose_name = 'Azure AD Settings'
@@ -403,23 +457,56 @@ class AzureADSettings(models.Model):
         return f"Azure AD Settings ({status})"
     
     def save(self, *args, **kwargs):
-        # Clear cache when settings are updated
-        cache.delete('azure_ad_settings')
         super().save(*args, **kwargs)
+        # Invalidate cached settings by moving readers to a new version key
+        # once the row is written, instead of deleting the shared entry
+        cache.add(SETTINGS_CACHE_VERSION_KEY, 0, None)
+        try:
+            cache.incr(SETTINGS_CACHE_VERSION_KEY)
+        except ValueError:
+            # Version key was evicted between add() and incr()
+            cache.set(SETTINGS_CACHE_VERSION_KEY, 1, None)
+        _local_settings_cache['value'] = None
     
     @classmethod
     def get_settings(cls):
-        """Get cached Azure AD settings or create default if none exist."""
-        settings = cache.get('azure_ad_settings')
+        """
+        Get cached Azure AD settings or create default if none exist.
+        
+        Settings are kept in process memory for a short TTL in front of the
+        shared Django cache, so other workers pick up changes within that TTL.
+        The returned instance is shared and partly deferred; use
+        get_full_settings() for anything that saves.
+        """
+        now = time.monotonic()
+        if _local_settings_cache['value'] is not None and now < _local_settings_cache['expires']:
+            return _local_settings_cache['value']
+        
+        cache_key = _settings_cache_key()
+        settings = cache.get(cache_key)
         if settings is None:
-            settings, created = cls.objects.get_or_create(
-                id=1,  # Singleton pattern - only one settings record
-                defaults={
-                    'enabled': False,
-                    'sync_enabled': False,
-                }
-            )
-            cache.set('azure_ad_settings', settings, 300)  # Cache for 5 minutes
+            try:
+                # Singleton pattern - only one settings record
+                settings = cls.objects.only(*cls.SYNC_CONFIG_FIELDS).get(id=1)
+            except cls.DoesNotExist:
+                settings = cls.get_full_settings()
+            # add() keeps whichever worker populated this version first
+            cache.add(cache_key, settings, SETTINGS_CACHE_TIMEOUT)
+        
+        _local_settings_cache['value'] = settings
+        _local_settings_cache['expires'] = now + LOCAL_SETTINGS_CACHE_TTL
+        return settings
+    
+    @classmethod
+    def get_full_settings(cls):
+        """Get the settings record with every column loaded, bypassing the cache."""
+        settings, created = cls.objects.select_related('updated_by').get_or_create(
+            id=1,
+            defaults={
+                'enabled': False,
+                'sync_enabled': False,
+            }
+        )
         return settings
     
     @property
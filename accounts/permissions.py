@@ -7,6 +7,56 @@ to provide fine-grained access control throughout the HRIS platform.
 
 from rest_framework import permissions
 
+from .models import User
+
+
+# Role groups checked by the permission classes below
+_HR_OR_ADMIN_ROLES = frozenset({User.Role.ADMIN, User.Role.HR_MANAGER})
+_MANAGER_OR_ADMIN_ROLES = _HR_OR_ADMIN_ROLES | {User.Role.HIRING_MANAGER}
+_CANDIDATE_OR_ADMIN_ROLES = _HR_OR_ADMIN_ROLES | {User.Role.CANDIDATE}
+
+# Resolvers returning the department id an object belongs to, keyed by model label.
+# FK ``*_id`` columns are compared directly so no related row is loaded just to
+# read its primary key.
+_DEPARTMENT_ID_RESOLVERS = {
+    'accounts.User': lambda obj: obj.department_id,
+    'accounts.UserSession': lambda obj: obj.user.department_id,
+    'employees.JobTitle': lambda obj: obj.department_id,
+    'employees.EmployeeProfile': lambda obj: obj.department_id,
+    'employees.PerformanceReview': lambda obj: obj.employee.department_id,
+    'employees.TimeOffRequest': lambda obj: obj.employee.department_id,
+    'recruitment.JobPosting': lambda obj: obj.department_id,
+    'recruitment.Applicant': lambda obj: obj.job.department_id,
+    'recruitment.JobOfferment': lambda obj: obj.job.department_id,
+}
+
+# Resolvers returning the id of the user that owns an object, keyed by model label.
+_OWNER_ID_RESOLVERS = {
+    'accounts.User': lambda obj: obj.pk,
+    'accounts.UserSession': lambda obj: obj.user_id,
+    'accounts.PasswordResetToken': lambda obj: obj.user_id,
+    'employees.EmployeeProfile': lambda obj: obj.user_id,
+}
+
+
+def _resolve(resolvers, obj):
+    """Look up the resolver for obj's model and apply it, or return None."""
+    meta = getattr(obj, '_meta', None)
+    resolver = resolvers.get(meta.label) if meta is not None else None
+    return resolver(obj) if resolver is not None else None
+
+
+def _is_owner(obj, user):
+    """Check whether user owns obj."""
+    owner_id = _resolve(_OWNER_ID_RESOLVERS, obj)
+    return owner_id is not None and owner_id == user.pk
+
+
+def _in_user_department(obj, user):
+    """Check whether obj belongs to user's department."""
+    department_id = _resolve(_DEPARTMENT_ID_RESOLVERS, obj)
+    return department_id is not None and department_id == user.department_id
+
 
 class IsAdminUser(permissions.BasePermission):
     """
@@ -14,10 +64,11 @@ class IsAdminUser(permissions.BasePermission):
     """
     
     def has_permission(self, request, view):
-        return (
-            request.user and 
-            request.user.is_authenticated and 
-            request.user.is_admin
+        user = request.user
+        return bool(
+            user and
+            user.is_authenticated and
+            (user.is_superuser or user.is_admin)
         )
 
 
@@ -27,10 +78,11 @@ class IsHRManagerOrAdmin(permissions.BasePermission):
     """
     
     def has_permission(self, request, view):
-        return (
-            request.user and 
-            request.user.is_authenticated and 
-            (request.user.is_hr_manager or request.user.is_admin)
+        user = request.user
+        return bool(
+            user and
+            user.is_authenticated and
+            (user.is_superuser or user.role in _HR_OR_ADMIN_ROLES)
         )
 
 
@@ -40,12 +92,11 @@ class IsManagerOrAdmin(permissions.BasePermission):
     """
     
     def has_permission(self, request, view):
-        return (
-            request.user and 
-            request.user.is_authenticated and 
-            (request.user.is_hiring_manager or 
-             request.user.is_hr_manager or 
-             request.user.is_admin)
+        user = request.user
+        return bool(
+            user and
+            user.is_authenticated and
+            (user.is_superuser or user.role in _MANAGER_OR_ADMIN_ROLES)
         )
 
 
@@ -56,24 +107,16 @@ class IsOwnerOrManagerOrAdmin(permissions.BasePermission):
     """
     
     def has_object_permission(self, request, view, obj):
-        # Check if the object has a user field (for user-owned resources)
-        if hasattr(obj, 'user'):
-            return (
-                obj.user == request.user or
-                request.user.is_hr_manager or
-                request.user.is_admin
-            )
+        user = request.user
+        if user.is_superuser or user.is_admin:
+            return True
         
-        # Check if the object is a User instance
-        if hasattr(obj, 'email'):  # User model check
-            return (
-                obj == request.user or
-                request.user.is_hr_manager or
-                request.user.is_admin
-            )
+        # User instances and user-owned resources
+        if _resolve(_OWNER_ID_RESOLVERS, obj) is not None:
+            return user.is_hr_manager or _is_owner(obj, user)
         
         # Default to admin-only access for other objects
-        return request.user.is_admin
+        return False
 
 
 class IsCandidateOrAdmin(permissions.BasePermission):
@@ -82,12 +125,11 @@ class IsCandidateOrAdmin(permissions.BasePermission):
     """
     
     def has_permission(self, request, view):
-        return (
-            request.user and 
-            request.user.is_authenticated and 
-            (request.user.is_candidate or 
-             request.user.is_hr_manager or 
-             request.user.is_admin)
+        user = request.user
+        return bool(
+            user and
+            user.is_authenticated and
+            (user.is_superuser or user.role in _CANDIDATE_OR_ADMIN_ROLES)
         )
 
 
@@ -98,37 +140,27 @@ class DepartmentBasedPermission(permissions.BasePermission):
     """
     
     def has_permission(self, request, view):
-        return (
-            request.user and 
-            request.user.is_authenticated and 
-            not request.user.is_candidate
+        user = request.user
+        return bool(
+            user and
+            user.is_authenticated and
+            (user.is_superuser or not user.is_candidate)
         )
     
     def has_object_permission(self, request, view, obj):
+        user = request.user
+        
         # Admin and HR managers have access to everything
-        if request.user.is_admin or request.user.is_hr_manager:
+        if user.is_superuser or user.role in _HR_OR_ADMIN_ROLES:
             return True
         
         # Hiring managers can only access their department's data
-        if request.user.is_hiring_manager:
-            # Check if object has a department field
-            if hasattr(obj, 'department'):
-                return obj.department == request.user.department
-            
-            # Check if object is related to a user with department
-            if hasattr(obj, 'user') and hasattr(obj.user, 'department'):
-                return obj.user.department == request.user.department
-            
-            # Check if object has an employee field with department
-            if hasattr(obj, 'employee') and hasattr(obj.employee, 'department'):
-                return obj.employee.department == request.user.department
+        if user.is_hiring_manager:
+            return _in_user_department(obj, user)
         
         # Employees can only access their own data
-        if request.user.is_employee:
-            if hasattr(obj, 'user'):
-                return obj.user == request.user
-            if hasattr(obj, 'email'):  # User model
-                return obj == request.user
+        if user.is_employee:
+            return _is_owner(obj, user)
         
         return False
 
@@ -140,7 +172,8 @@ class ReadOnlyOrManagerPermission(permissions.BasePermission):
     """
     
     def has_permission(self, request, view):
-        if not (request.user and request.user.is_authenticated):
+        user = request.user
+        if not (user and user.is_authenticated):
             return False
         
         # Read permissions for all authenticated users
@@ -148,11 +181,7 @@ class ReadOnlyOrManagerPermission(permissions.BasePermission):
             return True
         
         # Write permissions only for managers and admins
-        return (
-            request.user.is_hiring_manager or 
-            request.user.is_hr_manager or 
-            request.user.is_admin
-        )
+        return user.is_superuser or user.role in _MANAGER_OR_ADMIN_ROLES
 
 
 class JobApplicationPermission(permissions.BasePermission):
@@ -164,20 +193,21 @@ class JobApplicationPermission(permissions.BasePermission):
     """
     
     def has_permission(self, request, view):
-        return request.user and request.user.is_authenticated
+        return bool(request.user and request.user.is_authenticated)
     
     def has_object_permission(self, request, view, obj):
+        user = request.user
+        
         # Admin and HR managers have full access
-        if request.user.is_admin or request.user.is_hr_manager:
+        if user.is_superuser or user.role in _HR_OR_ADMIN_ROLES:
             return True
         
         # Candidates can only access their own applications
-        if request.user.is_candidate:
-            return hasattr(obj, 'candidate') and obj.candidate == request.user
+        if user.is_candidate:
+            return hasattr(obj, 'candidate') and obj.candidate == user
         
         # Hiring managers can access applications for their department's jobs
-        if request.user.is_hiring_manager:
-            if hasattr(obj, 'job') and hasattr(obj.job, 'department'):
-                return obj.job.department == request.user.department
+        if user.is_hiring_manager:
+            return _in_user_department(obj, user)
         
         return False
\ No newline at end of file
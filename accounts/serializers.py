@@ -7,11 +7,18 @@ API operations including registration, authentication, and profile management.
 
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import check_password
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from .models import User, UserSession
 
 
+_ROLE_DISPLAY = dict(User.Role.choices)
+
+# Roles that only admins may assign when creating accounts
+_PRIVILEGED_ROLES = frozenset({User.Role.ADMIN, User.Role.HR_MANAGER})
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """
     Serializer for user registration.
@@ -54,7 +61,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if request and hasattr(request, 'user'):
             user_role = attrs.get('role', User.Role.EMPLOYEE)
-            if user_role in [User.Role.ADMIN, User.Role.HR_MANAGER]:
+            if user_role in _PRIVILEGED_ROLES:
                 if not (request.user.is_authenticated and request.user.is_admin):
                     raise serializers.ValidationError({
                         'role': 'Only admin users can create admin or HR manager accounts.'
@@ -75,8 +82,8 @@ class UserProfileSerializer(serializers.ModelSerializer):
     """
     Serializer for user profile information.
     """
-    full_name = serializers.CharField(source='get_full_name', read_only=True)
-    role_display = serializers.CharField(source='get_role_display', read_only=True)
+    full_name = serializers.SerializerMethodField()
+    role_display = serializers.SerializerMethodField()
     
     class Meta:
         model = User
@@ -87,6 +94,12 @@ class UserProfileSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'email', 'date_joined', 'last_login']
     
+    def get_full_name(self, obj):
+        return f"{obj.first_name} {obj.last_name}".strip()
+    
+    def get_role_display(self, obj):
+        return _ROLE_DISPLAY.get(obj.role, obj.role)
+    
     def update(self, instance, validated_data):
         """
         Update user profile with role change restrictions.
@@ -105,15 +118,19 @@ class UserProfileSerializer(serializers.ModelSerializer):
                     'You can only update your own profile.'
                 )
         
-        return super().update(instance, validated_data)
+        # Only write the columns present in the payload
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=list(validated_data.keys()))
+        return instance
 
 
 class UserListSerializer(serializers.ModelSerializer):
     """
     Simplified serializer for user listings.
     """
-    full_name = serializers.CharField(source='get_full_name', read_only=True)
-    role_display = serializers.CharField(source='get_role_display', read_only=True)
+    full_name = serializers.SerializerMethodField()
+    role_display = serializers.SerializerMethodField()
     
     class Meta:
         model = User
@@ -121,6 +138,12 @@ class UserListSerializer(serializers.ModelSerializer):
             'id', 'email', 'full_name', 'role', 'role_display',
             'department', 'job_title', 'is_active'
         ]
+    
+    def get_full_name(self, obj):
+        return f"{obj.first_name} {obj.last_name}".strip()
+    
+    def get_role_display(self, obj):
+        return _ROLE_DISPLAY.get(obj.role, obj.role)
 
 
 class PasswordChangeSerializer(serializers.Serializer):
@@ -144,9 +167,13 @@ class PasswordChangeSerializer(serializers.Serializer):
     def validate_old_password(self, value):
         """
         Validate the old password.
+        
+        Uses hashers.check_password() rather than User.check_password() so a
+        hash upgrade does not write to the database during validation; save()
+        stores a fresh hash anyway.
         """
         user = self.context['request'].user
-        if not user.check_password(value):
+        if not check_password(value, user.password):
             raise serializers.ValidationError('Invalid old password.')
         return value
     
@@ -171,13 +198,17 @@ class PasswordChangeSerializer(serializers.Serializer):
         user = self.context['request'].user
         new_password = self.validated_data['new_password']
         user.set_password(new_password)
-        user.save()
+        user.save(update_fields=['password'])
         return user
 
 
 class UserSessionSerializer(serializers.ModelSerializer):
     """
     Serializer for user session tracking.
+    
+    Requires queryset.select_related('user') to avoid N+1; views should pass
+    their queryset through setup_eager_loading() so the session's user is
+    fetched in the same query.
     """
     user_email = serializers.CharField(source='user.email', read_only=True)
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
@@ -189,6 +220,11 @@ class UserSessionSerializer(serializers.ModelSerializer):
             'created_at', 'last_activity', 'is_active'
         ]
         read_only_fields = ['id', 'created_at']
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the related rows this serializer reads."""
+        return queryset.select_related('user')
 
 
 class LoginSerializer(serializers.Serializer):
@@ -1,28 +1,122 @@
 """
-Celery tasks for Azure AD synchronization.
+Celery tasks for Azure AD synchronization and account bookkeeping.
 
 These tasks handle background synchronization between the HRIS platform
-and Azure AD to ensure data consistency and reliability.
+and Azure AD to ensure data consistency and reliability, along with
+account writes that are kept out of the request path.
 """
 
 import logging
+import time
+from collections import Counter
+from itertools import islice
 from typing import Dict, Any
 
-from celery import shared_task
+import requests
+from celery import group, shared_task
 from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError
 from django.utils import timezone
 
-from .models import User
-from .azure_ad_service import azure_ad_service
+from .models import PasswordResetToken, User, UserSession
+from .azure_ad_service import TEST_CONNECTION_CACHE_TIMEOUT, azure_ad_service
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task(bind=True, max_retries=3, default_retry_delay=300)
+# Number of sync tasks enqueued per broker publish in bulk operations
+BULK_SYNC_CHUNK_SIZE = 500
+
+# Maximum number of ids passed in a single id__in lookup
+ID_LOOKUP_CHUNK_SIZE = 1000
+
+# Single-flight guard for test_azure_ad_connection
+TEST_CONNECTION_LOCK_KEY = 'azure_ad_test_connection_task:lock'
+TEST_CONNECTION_RESULT_KEY = 'azure_ad_test_connection_task:result'
+TEST_CONNECTION_LOCK_TIMEOUT = 10
+
+
+class AzureADTransientError(Exception):
+    """
+    Raised when an Azure AD operation fails in a way that may succeed on retry.
+    """
+
+
+def _chunked(items, size: int):
+    """Yield successive lists of at most size elements from any iterable."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _iter_sync_user_ids(user_ids: list = None):
+    """
+    Stream the ids of sync-enabled users without caching the queryset.
+    
+    Explicit id lists are looked up in slices of ID_LOOKUP_CHUNK_SIZE to keep
+    each IN clause within database parameter limits. Without ids, every
+    pending user is returned.
+    """
+    if user_ids:
+        for id_chunk in _chunked(user_ids, ID_LOOKUP_CHUNK_SIZE):
+            yield from User.objects.filter(
+                id__in=id_chunk,
+                azure_ad_sync_enabled=True
+            ).values_list('id', flat=True).iterator()
+    else:
+        # Sync all users with pending status
+        yield from User.objects.filter(
+            azure_ad_sync_status='pending',
+            azure_ad_sync_enabled=True
+        ).values_list('id', flat=True).iterator(chunk_size=2000)
+
+
+# Service calls for each sync action; 'create' and 'sync' both use intelligent
+# sync, which creates or updates as needed
+_SYNC_ACTION_HANDLERS = {
+    'create': lambda user: azure_ad_service.sync_user_from_hris(user, force_create=True),
+    'update': lambda user: azure_ad_service.update_user(user),
+    'disable': lambda user: azure_ad_service.disable_user(user),
+    'delete': lambda user: azure_ad_service.delete_user(user),
+    'sync': lambda user: azure_ad_service.sync_user_from_hris(user, force_create=True),
+}
+VALID_ACTIONS = frozenset(_SYNC_ACTION_HANDLERS)
+
+
+def _run_sync_action(user: User, action: str):
+    """
+    Perform a single Azure AD action for user.
+    
+    Returns:
+        The (success, result) tuple from the service
+    """
+    return _SYNC_ACTION_HANDLERS[action](user)
+
+
+@shared_task(
+    bind=True,
+    rate_limit='120/m',
+    autoretry_for=(AzureADTransientError, requests.RequestException),
+    max_retries=11,
+    retry_backoff=60,
+    retry_backoff_max=3600,
+    retry_jitter=True,
+)
 def sync_user_to_azure_ad(self, user_id: int, action: str = 'create') -> Dict[str, Any]:
     """
     Sync a user to Azure AD.
     
+    Failed Graph operations raise AzureADTransientError and are retried by
+    Celery with jittered exponential backoff. Unknown users and invalid
+    actions are not retried.
+    
+    Callers are expected to mark the user's sync status as pending when
+    queueing the task.
+    
     Args:
         user_id: The ID of the user to sync
         action: The action to perform ('create', 'update', 'disable', 'delete')
@@ -38,6 +132,15 @@ def sync_user_to_azure_ad(self, user_id: int, action: str = 'create') -> Dict[st
             'action': action
         }
     
+    if action not in VALID_ACTIONS:
+        logger.error(f"Invalid action: {action}")
+        return {
+            'success': False,
+            'error': f'Invalid action: {action}',
+            'user_id': user_id,
+            'action': action
+        }
+    
     try:
         user = User.objects.get(id=user_id)
     except User.DoesNotExist:
@@ -49,74 +152,31 @@ def sync_user_to_azure_ad(self, user_id: int, action: str = 'create') -> Dict[st
             'action': action
         }
     
-    # Update sync status to pending
-    user.azure_ad_sync_status = 'pending'
-    user.save()
-    
     try:
-        if action == 'create':
-            # Use intelligent sync that automatically chooses create or update
-            success, result = azure_ad_service.sync_user_from_hris(user, force_create=True)
-        elif action == 'update':
-            success, result = azure_ad_service.update_user(user)
-        elif action == 'disable':
-            success, result = azure_ad_service.disable_user(user)
-        elif action == 'delete':
-            success, result = azure_ad_service.delete_user(user)
-        elif action == 'sync':
-            # New action: intelligent sync (create or update as needed)
-            success, result = azure_ad_service.sync_user_from_hris(user, force_create=True)
-        else:
-            logger.error(f"Invalid action: {action}")
-            return {
-                'success': False,
-                'error': f'Invalid action: {action}',
-                'user_id': user_id,
-                'action': action
-            }
-        
-        if success:
-            logger.info(f"Successfully {action}d user {user.email} in Azure AD")
-            return {
-                'success': True,
-                'message': f'User {action}d successfully in Azure AD',
-                'user_id': user_id,
-                'action': action,
-                'result': result
-            }
-        else:
-            # Retry on failure
-            if self.request.retries < self.max_retries:
-                logger.warning(f"Retrying Azure AD sync for user {user.email} (attempt {self.request.retries + 1})")
-                raise self.retry(countdown=self.default_retry_delay * (2 ** self.request.retries))
-            else:
-                logger.error(f"Failed to {action} user {user.email} in Azure AD after {self.max_retries} retries: {result}")
-                return {
-                    'success': False,
-                    'error': f'Failed to {action} user in Azure AD',
-                    'user_id': user_id,
-                    'action': action,
-                    'details': result
-                }
+        success, result = _run_sync_action(user, action)
     
     except Exception as e:
         logger.error(f"Exception during Azure AD sync for user {user.email}: {str(e)}")
         
         # Update sync status to failed
-        user.azure_ad_sync_status = 'failed'
-        user.save()
-        
-        # Retry on exception
-        if self.request.retries < self.max_retries:
-            logger.warning(f"Retrying Azure AD sync for user {user.email} due to exception (attempt {self.request.retries + 1})")
-            raise self.retry(countdown=self.default_retry_delay * (2 ** self.request.retries))
-        else:
-            return {
-                'success': False,
-                'error': f'Exception during Azure AD sync: {str(e)}',
-                'user_id': user_id,
-                'action': action
-            }
+        User.objects.filter(pk=user_id).update(azure_ad_sync_status='failed')
+        raise
+    
+    if not success:
+        logger.warning(
+            f"Failed to {action} user {user.email} in Azure AD "
+            f"(attempt {self.request.retries + 1}): {result}"
+        )
+        raise AzureADTransientError(result)
+    
+    logger.info(f"Successfully {action}d user {user.email} in Azure AD")
+    return {
+        'success': True,
+        'message': f'User {action}d successfully in Azure AD',
+        'user_id': user_id,
+        'action': action,
+        'result': result
+    }
 
 
 @shared_task
@@ -140,53 +200,130 @@ def bulk_sync_users_to_azure_ad(user_ids: list = None, action: str = 'create') -
             'failed': 0
         }
     
-    # Get users to sync
-    if user_ids:
-        users = User.objects.filter(id__in=user_ids, azure_ad_sync_enabled=True)
-    else:
-        # Sync all users with pending status
-        users = User.objects.filter(
-            azure_ad_sync_status='pending',
-            azure_ad_sync_enabled=True
-        )
+    if action not in VALID_ACTIONS:
+        logger.error(f"Invalid action: {action}")
+        return {
+            'success': False,
+            'error': f'Invalid action: {action}',
+            'total_users': 0,
+            'successful': 0,
+            'failed': 0
+        }
     
-    total_users = users.count()
+    total_users = 0
     successful = 0
     failed = 0
-    results = []
     
-    logger.info(f"Starting bulk Azure AD sync for {total_users} users")
+    logger.info("Starting bulk Azure AD sync")
+    started = time.monotonic()
+    
+    # Publish one group per chunk rather than one .delay() round-trip per user
+    for chunk in _chunked(_iter_sync_user_ids(user_ids), BULK_SYNC_CHUNK_SIZE):
+        total_users += len(chunk)
+        try:
+            # Mark the chunk pending here so the individual tasks skip that write
+            User.objects.filter(id__in=chunk).update(
+                azure_ad_sync_status='pending',
+                azure_ad_sync_started_at=timezone.now()
+            )
+            group(sync_user_to_azure_ad.s(user_id, action) for user_id in chunk).apply_async()
+            successful += len(chunk)
+        except Exception as e:
+            logger.error(f"Failed to queue sync tasks for {len(chunk)} users: {str(e)}")
+            logger.debug(f"User IDs not queued: {chunk}")
+            User.objects.filter(id__in=chunk).update(azure_ad_sync_status='failed')
+            failed += len(chunk)
+    
+    elapsed_ms = (time.monotonic() - started) * 1000
+    logger.info(
+        f"Bulk Azure AD sync completed: {successful} queued, {failed} failed to queue "
+        f"in {elapsed_ms:.0f}ms"
+    )
+    
+    return {
+        'success': True,
+        'total_users': total_users,
+        'successful': successful,
+        'failed': failed
+    }
+
+
+@shared_task(rate_limit='10/m')
+def sync_user_batch_to_azure_ad(user_ids: list, action: str = 'sync') -> Dict[str, Any]:
+    """
+    Sync a batch of users to Azure AD inside a single worker.
+    
+    Cheaper than one task per user when the Graph API rather than task dispatch
+    is the bottleneck. Users whose sync fails are handed to
+    sync_user_to_azure_ad so they are retried with backoff.
+    
+    Args:
+        user_ids: List of user IDs to sync
+        action: The action to perform for all users
+    
+    Returns:
+        Dict containing batch sync results
+    """
+    if not settings.AZURE_AD_ENABLED or not settings.AZURE_AD_SYNC_ENABLED:
+        return {
+            'success': False,
+            'error': 'Azure AD sync is disabled',
+            'total_users': 0,
+            'successful': 0,
+            'failed': 0
+        }
+    
+    if action not in VALID_ACTIONS:
+        logger.error(f"Invalid action: {action}")
+        return {
+            'success': False,
+            'error': f'Invalid action: {action}',
+            'total_users': 0,
+            'successful': 0,
+            'failed': 0
+        }
+    
+    users = User.objects.filter(id__in=user_ids, azure_ad_sync_enabled=True)
+    
+    total_users = 0
+    successful = 0
+    failed_ids = []
+    
+    # Exceptions are tallied by type and logged once after the loop
+    exception_counts = Counter()
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
     
     for user in users:
+        total_users += 1
         try:
-            # Queue individual sync task
-            result = sync_user_to_azure_ad.delay(user.id, action)
-            results.append({
-                'user_id': user.id,
-                'email': user.email,
-                'task_id': result.id,
-                'status': 'queued'
-            })
+            outcome = _run_sync_action(user, action)
         except Exception as e:
-            logger.error(f"Failed to queue sync task for user {user.email}: {str(e)}")
-            failed += 1
-            results.append({
-                'user_id': user.id,
-                'email': user.email,
-                'status': 'failed_to_queue',
-                'error': str(e)
-            })
+            exception_counts[type(e).__name__] += 1
+            if debug_enabled:
+                logger.debug(f"Exception during Azure AD sync for user {user.email}: {str(e)}")
+            outcome = (False, {'error': str(e)})
+        
+        if outcome[0]:
+            successful += 1
+        else:
+            failed_ids.append(user.id)
     
-    successful = len([r for r in results if r['status'] == 'queued'])
+    if exception_counts:
+        logger.error(f"Exceptions during batch Azure AD sync: {dict(exception_counts)}")
     
-    logger.info(f"Bulk Azure AD sync completed: {successful} queued, {failed} failed to queue")
+    if failed_ids:
+        group(sync_user_to_azure_ad.s(user_id, action) for user_id in failed_ids).apply_async()
+    
+    logger.info(
+        f"Batch Azure AD sync completed: {successful} synced, "
+        f"{len(failed_ids)} queued for retry"
+    )
     
     return {
         'success': True,
         'total_users': total_users,
         'successful': successful,
-        'failed': failed,
-        'results': results
+        'failed': len(failed_ids)
     }
 
 
@@ -206,29 +343,35 @@ def sync_failed_users_retry() -> Dict[str, Any]:
             'retried_users': 0
         }
     
+    started = time.monotonic()
+    
     # Get users with failed sync status
     failed_users = User.objects.filter(
         azure_ad_sync_status='failed',
         azure_ad_sync_enabled=True
     )
+    failed_user_ids = list(failed_users.values_list('id', flat=True))
     
     retried_count = 0
     
-    for user in failed_users:
-        try:
-            # Use intelligent sync action that handles both create and update
-            action = 'sync'
-            
-            # Queue retry task
-            sync_user_to_azure_ad.delay(user.id, action)
-            retried_count += 1
-            
-            logger.info(f"Queued retry for user {user.email}")
-            
-        except Exception as e:
-            logger.error(f"Failed to queue retry for user {user.email}: {str(e)}")
+    if failed_user_ids:
+        # Mark them pending in one UPDATE so the next run does not queue them again
+        User.objects.filter(id__in=failed_user_ids).update(
+            azure_ad_sync_status='pending',
+            azure_ad_sync_started_at=timezone.now()
+        )
+        
+        for chunk in _chunked(failed_user_ids, BULK_SYNC_CHUNK_SIZE):
+            try:
+                # Use intelligent sync action that handles both create and update
+                group(sync_user_to_azure_ad.s(user_id, 'sync') for user_id in chunk).apply_async()
+                retried_count += len(chunk)
+            except Exception as e:
+                logger.error(f"Failed to queue retry for {len(chunk)} users: {str(e)}")
+                User.objects.filter(id__in=chunk).update(azure_ad_sync_status='failed')
     
-    logger.info(f"Queued {retried_count} users for Azure AD sync retry")
+    elapsed_ms = (time.monotonic() - started) * 1000
+    logger.info(f"Queued {retried_count} users for Azure AD sync retry in {elapsed_ms:.0f}ms")
     
     return {
         'success': True,
@@ -237,11 +380,14 @@ def sync_failed_users_retry() -> Dict[str, Any]:
     }
 
 
-@shared_task
+@shared_task(rate_limit='6/m')
 def test_azure_ad_connection() -> Dict[str, Any]:
     """
     Test the connection to Azure AD/Microsoft Graph API.
     
+    Concurrent invocations are coalesced: while one test is running, other
+    callers get the most recent cached result instead of starting another.
+    
     Returns:
         Dict containing connection test results
     """
@@ -252,22 +398,39 @@ def test_azure_ad_connection() -> Dict[str, Any]:
             'timestamp': timezone.now().isoformat()
         }
     
+    if not cache.add(TEST_CONNECTION_LOCK_KEY, 1, TEST_CONNECTION_LOCK_TIMEOUT):
+        return cache.get(TEST_CONNECTION_RESULT_KEY, {
+            'success': None,
+            'error': 'Connection test already in progress',
+            'timestamp': timezone.now().isoformat()
+        })
+    
     try:
-        success, result = azure_ad_service.test_connection()
+        try:
+            success, result = azure_ad_service.test_connection()
+            
+            payload = {
+                'success': success,
+                'timestamp': timezone.now().isoformat(),
+                'result': result
+            }
         
-        return {
-            'success': success,
-            'timestamp': timezone.now().isoformat(),
-            'result': result
-        }
+        except Exception as e:
+            logger.error(f"Exception during Azure AD connection test: {str(e)}")
+            payload = {
+                'success': False,
+                'error': f'Exception during connection test: {str(e)}',
+                'timestamp': timezone.now().isoformat()
+            }
+        
+        # Publish the result before releasing the lock so no caller can
+        # start a second test in between
+        cache.set(TEST_CONNECTION_RESULT_KEY, payload, TEST_CONNECTION_CACHE_TIMEOUT)
     
-    except Exception as e:
-        logger.error(f"Exception during Azure AD connection test: {str(e)}")
-        return {
-            'success': False,
-            'error': f'Exception during connection test: {str(e)}',
-            'timestamp': timezone.now().isoformat()
-        }
+    finally:
+        cache.delete(TEST_CONNECTION_LOCK_KEY)
+    
+    return payload
 
 
 @shared_task
@@ -276,6 +439,9 @@ def cleanup_sync_status() -> Dict[str, Any]:
     Clean up old sync statuses and update pending users that have been
     stuck in pending state for too long.
     
+    Only users whose sync was actually queued (azure_ad_sync_started_at set)
+    are considered, so unrelated profile edits do not hide stuck syncs.
+    
     Returns:
         Dict containing cleanup results
     """
@@ -286,7 +452,7 @@ def cleanup_sync_status() -> Dict[str, Any]:
     
     stuck_users = User.objects.filter(
         azure_ad_sync_status='pending',
-        updated_at__lt=stuck_threshold
+        azure_ad_sync_started_at__lt=stuck_threshold
     )
     
     updated_count = stuck_users.update(azure_ad_sync_status='failed')
@@ -297,4 +463,47 @@ def cleanup_sync_status() -> Dict[str, Any]:
         'success': True,
         'updated_users': updated_count,
         'message': f'Reset {updated_count} stuck pending users'
-    }
\ No newline at end of file
+    }
+
+
+@shared_task
+def cleanup_expired_password_reset_tokens() -> Dict[str, Any]:
+    """
+    Delete password reset tokens whose expiry time has passed.
+    
+    Scheduled through CELERY_BEAT_SCHEDULE.
+    
+    Returns:
+        Dict containing cleanup results
+    """
+    deleted_count, _ = PasswordResetToken.objects.expired().delete()
+    
+    logger.info(f"Deleted {deleted_count} expired password reset tokens")
+    
+    return {
+        'success': True,
+        'deleted_tokens': deleted_count,
+        'message': f'Deleted {deleted_count} expired password reset tokens'
+    }
+
+
+@shared_task(ignore_result=True)
+def record_user_session(user_id: int, session_key: str, ip_address: str, user_agent: str) -> None:
+    """
+    Record a login session outside the login request.
+    
+    Args:
+        user_id: The ID of the user who logged in
+        session_key: Django session key, or an empty string for token-only logins
+        ip_address: Client IP address
+        user_agent: Client User-Agent header
+    """
+    try:
+        UserSession.objects.create(
+            user_id=user_id,
+            session_key=session_key,
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+    except IntegrityError as e:
+        logger.warning(f"Could not record session for user {user_id}: {str(e)}")
@@ -5,18 +5,22 @@ This module contains Django REST Framework views for handling user authenticatio
 registration, profile management, and role-based operations.
 """
 
+import ipaddress
+import logging
+
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import login
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 
 from .models import User, UserSession
+from .tasks import record_user_session
 from .serializers import (
     UserRegistrationSerializer,
     UserProfileSerializer,
@@ -31,6 +35,8 @@ from .permissions import (
     IsOwnerOrManagerOrAdmin
 )
 
+logger = logging.getLogger(__name__)
+
 
 class UserRegistrationView(generics.CreateAPIView):
     """
@@ -81,12 +87,13 @@ class LoginView(APIView):
         user_agent = request.META.get('HTTP_USER_AGENT', '')
         ip_address = self.get_client_ip(request)
         
-        UserSession.objects.create(
-            user=user,
-            session_key=request.session.session_key or '',
-            ip_address=ip_address,
-            user_agent=user_agent
-        )
+        session_args = (user.id, request.session.session_key or '', ip_address, user_agent)
+        try:
+            record_user_session.delay(*session_args)
+        except Exception as e:
+            # Broker unavailable; record the session inline rather than fail the login
+            logger.warning(f"Could not queue session record for user {user.id}: {str(e)}")
+            record_user_session(*session_args)
         
         # Generate JWT tokens
         refresh = RefreshToken.for_user(user)
@@ -104,11 +111,22 @@ class LoginView(APIView):
         """
         Get the client's IP address from the request.
         """
+        ip = getattr(request, '_client_ip', None)
+        if ip is not None:
+            return ip
+        
+        ip = request.META.get('REMOTE_ADDR')
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
+            forwarded_ip = x_forwarded_for.split(',', 1)[0].strip()
+            try:
+                ipaddress.ip_address(forwarded_ip)
+                ip = forwarded_ip
+            except ValueError:
+                # Ignore malformed header values and fall back to REMOTE_ADDR
+                pass
+        
+        request._client_ip = ip
         return ip
 
 
@@ -125,7 +143,11 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
         """
         pk = self.kwargs.get('pk')
         if pk == 'me':
-            return self.request.user
+            user = self.request.user
+            # Session users are restored with a reduced column set
+            if user.get_deferred_fields():
+                return User.objects.get(pk=user.pk)
+            return user
         return generics.get_object_or_404(User, pk=pk)
 
 
@@ -137,25 +159,28 @@ class UserListView(generics.ListAPIView):
     permission_classes = [IsHRManagerOrAdmin]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['role', 'department', 'is_active']
-    search_fields = ['first_name', 'last_name', 'email', 'department']
+    search_fields = ['first_name', 'last_name', 'email', 'department__name']
     ordering_fields = ['first_name', 'last_name', 'email', 'date_joined']
     ordering = ['first_name', 'last_name']
     
     def get_queryset(self):
         """
         Return queryset based on user role.
+        
+        UserListSerializer renders department and job_title as primary keys,
+        so slim() needs no joins; the department is only joined when searching.
         """
         user = self.request.user
         
         if user.is_admin or user.is_hr_manager:
             # Admin and HR managers can see all users
-            return User.objects.all()
+            return User.objects.slim()
         elif user.is_hiring_manager:
             # Hiring managers can see users in their department
-            return User.objects.filter(department=user.department)
+            return User.objects.slim().filter(department_id=user.department_id)
         else:
             # Regular employees can only see basic info of colleagues
-            return User.objects.filter(is_active=True).exclude(role='candidate')
+            return User.objects.slim().filter(is_active=True).exclude(role='candidate')
 
 
 class PasswordChangeView(APIView):
@@ -192,13 +217,15 @@ class UserDeactivateView(APIView):
         """
         user = generics.get_object_or_404(User, pk=pk)
         
-        if user.is_admin and User.objects.filter(role=User.Role.ADMIN, is_active=True).count() <= 1:
+        if user.is_admin and not User.objects.filter(
+            role=User.Role.ADMIN, is_active=True
+        ).exclude(pk=user.pk).exists():
             return Response({
                 'error': 'Cannot deactivate the last admin user'
             }, status=status.HTTP_400_BAD_REQUEST)
         
         user.is_active = False
-        user.save()
+        user.save(update_fields=['is_active'])
         
         return Response({
             'message': f'User {user.email} has been deactivated'
@@ -217,7 +244,7 @@ class UserReactivateView(APIView):
         """
         user = generics.get_object_or_404(User, pk=pk)
         user.is_active = True
-        user.save()
+        user.save(update_fields=['is_active'])
         
         return Response({
             'message': f'User {user.email} has been reactivated'
@@ -238,7 +265,7 @@ class UserSessionListView(generics.ListAPIView):
         """
         Return sessions, optionally filtered by user.
         """
-        queryset = UserSession.objects.select_related('user')
+        queryset = UserSessionSerializer.setup_eager_loading(UserSession.objects.all())
         user_id = self.request.query_params.get('user_id')
         if user_id:
             queryset = queryset.filter(user_id=user_id)
@@ -256,10 +283,11 @@ class MySessionsView(generics.ListAPIView):
         """
         Return current user's sessions.
         """
-        return UserSession.objects.filter(
+        queryset = UserSession.objects.filter(
             user=self.request.user,
             is_active=True
         ).order_by('-last_activity')
+        return UserSessionSerializer.setup_eager_loading(queryset)
 
 
 @api_view(['POST'])
@@ -292,17 +320,27 @@ def user_stats_view(request):
             'error': 'Permission denied'
         }, status=status.HTTP_403_FORBIDDEN)
     
+    now = timezone.now()
+    counts = User.objects.aggregate(
+        total_users=Count('id'),
+        active_users=Count('id', filter=Q(is_active=True)),
+        new_users_this_month=Count('id', filter=Q(
+            date_joined__year=now.year,
+            date_joined__month=now.month
+        ))
+    )
+    role_counts = dict(
+        User.objects.order_by().values_list('role').annotate(n=Count('id'))
+    )
+    
     stats = {
-        'total_users': User.objects.count(),
-        'active_users': User.objects.filter(is_active=True).count(),
+        'total_users': counts['total_users'],
+        'active_users': counts['active_users'],
         'users_by_role': {
-            role[0]: User.objects.filter(role=role[0]).count()
-            for role in User.Role.choices
+            role: role_counts.get(role, 0)
+            for role in User.Role.values
         },
-        'new_users_this_month': User.objects.filter(
-            date_joined__month=timezone.now().month,
-            date_joined__year=timezone.now().year
-        ).count()
+        'new_users_this_month': counts['new_users_this_month']
     }
     
     return Response(stats)
@@ -6,6 +6,8 @@ cat > .env.example << 'EOF'
 DEBUG=True
 SECRET_KEY=your-secret-key-here-generate-with-python-secrets
 ALLOWED_HOSTS=localhost,127.0.0.1
+# Add this server's detected IP address to ALLOWED_HOSTS
+DETECT_SERVER_IP=True
 
 # Database Configuration
 DB_NAME=hris_platform
@@ -17,6 +19,7 @@ DB_PORT=5432
 # Redis Configuration
 CELERY_BROKER_URL=redis://redis:6380/0
 CELERY_RESULT_BACKEND=redis://redis:6380/0
+CACHE_URL=redis://redis:6380/1
 
 # Email Configuration (Production)
 EMAIL_BACKEND=django.core.mail.backends.console.EmailBackend
@@ -33,6 +33,9 @@ class JobTitleAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_employee_count()
 
 
 @admin.register(Department)
@@ -41,6 +44,9 @@ class DepartmentAdmin(admin.ModelAdmin):
     list_filter = ['is_active', 'parent_department']
     search_fields = ['name', 'code', 'description']
     readonly_fields = ['employee_count', 'created_at', 'updated_at']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_employee_count()
 
 
 @admin.register(EmployeeProfile)
@@ -0,0 +1,44 @@
+"""
+Custom managers for the employees app.
+
+This module provides querysets for organizational models that can compute
+per-row aggregates in the same query as the rows themselves.
+"""
+
+from django.db import models
+from django.db.models.functions import Concat, Trim
+
+
+def full_name_expression(user_path):
+    """
+    Build a database expression matching User.get_full_name() for user_path.
+    
+    Args:
+        user_path: Lookup path to the user relation, e.g. 'employee__user'
+    """
+    return Trim(Concat(
+        f'{user_path}__first_name',
+        models.Value(' '),
+        f'{user_path}__last_name',
+        output_field=models.CharField()
+    ))
+
+
+class EmployeeCountQuerySet(models.QuerySet):
+    """
+    QuerySet for models with an ``employees`` reverse relation.
+    """
+    
+    def with_employee_count(self):
+        """
+        Annotate each row with its number of active employees.
+        
+        The model's employee_count property reads this annotation instead of
+        running a COUNT query per row.
+        """
+        return self.annotate(
+            active_employee_count=models.Count(
+                'employees',
+                filter=models.Q(employees__is_active=True)
+            )
+        )
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-16 13:05
+
+import json
+
+from django.db import migrations, models
+
+
+def normalize_group_memberships(apps, schema_editor):
+    """Rewrite blank or malformed values as an empty JSON list before the cast to jsonb."""
+    EmployeeProfile = apps.get_model('employees', 'EmployeeProfile')
+    EmployeeProfile.objects.filter(azure_ad_group_memberships='').update(azure_ad_group_memberships='[]')
+    
+    invalid_ids = []
+    rows = EmployeeProfile.objects.exclude(
+        azure_ad_group_memberships='[]'
+    ).values_list('id', 'azure_ad_group_memberships').iterator()
+    for profile_id, value in rows:
+        try:
+            json.loads(value)
+        except ValueError:
+            invalid_ids.append(profile_id)
+    
+    if invalid_ids:
+        EmployeeProfile.objects.filter(id__in=invalid_ids).update(azure_ad_group_memberships='[]')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0004_employeeprofile_job_title_old_jobtitle_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_group_memberships, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='employeeprofile',
+            name='azure_ad_group_memberships',
+            field=models.JSONField(blank=True, default=list, help_text='List of Azure AD group memberships for this employee'),
+        ),
+    ]
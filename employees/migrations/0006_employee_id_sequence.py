@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-16 15:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0005_employeeprofile_group_memberships_json'),
+    ]
+
+    operations = [
+        # Sequence backing EmployeeProfile.save() employee ID generation.
+        # It continues from the highest existing EMP number, so the first
+        # value handed out on an empty table is 1001.
+        migrations.RunSQL(
+            sql="""
+                CREATE SEQUENCE IF NOT EXISTS employee_id_seq;
+                SELECT setval(
+                    'employee_id_seq',
+                    GREATEST(
+                        1000,
+                        COALESCE(
+                            (SELECT MAX(CAST(SUBSTRING(employee_id FROM 4) AS INTEGER))
+                             FROM employee_profiles
+                             WHERE employee_id ~ '^EMP[0-9]+$'),
+                            1000
+                        )
+                    )
+                );
+            """,
+            reverse_sql="DROP SEQUENCE IF EXISTS employee_id_seq;",
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-16 15:34
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0006_employee_id_sequence'),
+    ]
+
+    operations = [
+        # employee_id is unique=True, so the database already maintains an index for it
+        migrations.RemoveIndex(
+            model_name='employeeprofile',
+            name='employee_pr_employe_df7e0f_idx',
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-16 15:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0007_remove_employeeprofile_employee_id_idx'),
+    ]
+
+    operations = [
+        # Every date-range query on time-off requests is scoped to one employee
+        migrations.RemoveIndex(
+            model_name='timeoffrequest',
+            name='time_off_re_start_d_7163eb_idx',
+        ),
+        migrations.AddIndex(
+            model_name='timeoffrequest',
+            index=models.Index(fields=['employee', 'start_date', 'end_date'], name='tor_emp_dates_idx'),
+        ),
+    ]
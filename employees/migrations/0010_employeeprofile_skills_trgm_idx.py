@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-16 17:20
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0008_timeoffrequest_emp_dates_idx'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='employeeprofile',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper('skills'),
+                    name='gin_trgm_ops'
+                ),
+                name='emp_skills_trgm_idx'
+            ),
+        ),
+    ]
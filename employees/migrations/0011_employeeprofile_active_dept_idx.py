@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-16 17:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0010_employeeprofile_skills_trgm_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='employeeprofile',
+            name='employee_pr_departm_bbeb8d_idx',
+        ),
+        migrations.AddIndex(
+            model_name='employeeprofile',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['department'], name='emp_active_dept_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-16 17:46
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0011_employeeprofile_active_dept_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employeeprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['azure_ad_group_memberships'], name='emp_aad_groups_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
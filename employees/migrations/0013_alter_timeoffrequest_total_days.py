@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-16 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0012_employeeprofile_aad_groups_gin'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='timeoffrequest',
+            name='total_days',
+            field=models.PositiveSmallIntegerField(),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-16 19:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0013_alter_timeoffrequest_total_days'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employeeprofile',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['manager'], name='emp_active_mgr_idx'),
+        ),
+    ]
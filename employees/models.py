@@ -5,10 +5,14 @@ This module contains models for managing employee profiles, organizational struc
 and HR-related information beyond basic user authentication.
 """
 
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.core.cache import cache
+from django.db import connection, models, transaction
+from django.db.models.functions import Upper
 from django.utils import timezone
 from django.core.validators import RegexValidator, EmailValidator
 from accounts.models import User
+from .managers import EmployeeCountQuerySet
 
 
 class JobTitle(models.Model):
@@ -52,6 +56,8 @@ class JobTitle(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = EmployeeCountQuerySet.as_manager()
+    
     class Meta:
         db_table = 'job_titles'
         verbose_name = 'Job Title'
@@ -68,8 +74,15 @@ class JobTitle(models.Model):
     
     @property
     def employee_count(self):
-        """Return the number of employees with this job title."""
-        return self.employees.filter(is_active=True).count()
+        """
+        Return the number of employees with this job title.
+        
+        Uses the with_employee_count() annotation when present.
+        """
+        count = getattr(self, 'active_employee_count', None)
+        if count is None:
+            count = self.employees.filter(is_active=True).count()
+        return count
     
     @property
     def salary_range_display(self):
@@ -83,6 +96,44 @@ class JobTitle(models.Model):
         return "Not specified"
 
 
+# Cached department listings and statistics are stored under versioned keys;
+# writes to the rows they are built from bump the version
+DEPARTMENT_LIST_CACHE_VERSION_KEY = 'departments:list:v'
+DEPARTMENT_LIST_CACHE_TIMEOUT = 300
+DEPARTMENT_STATS_CACHE_VERSION_KEY = 'departments:stats:v'
+DEPARTMENT_STATS_CACHE_TIMEOUT = 300
+
+
+def _bump_cache_version(version_key):
+    """Move readers of a versioned cache entry to a new version."""
+    cache.add(version_key, 0, None)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        # Version key was evicted between add() and incr()
+        cache.set(version_key, 1, None)
+
+
+def department_list_cache_version():
+    """Return the current version of the cached department listings."""
+    return cache.get(DEPARTMENT_LIST_CACHE_VERSION_KEY, 0)
+
+
+def invalidate_department_list_cache():
+    """Move department list readers to a new cache version."""
+    _bump_cache_version(DEPARTMENT_LIST_CACHE_VERSION_KEY)
+
+
+def department_stats_cache_version():
+    """Return the current version of the cached department statistics."""
+    return cache.get(DEPARTMENT_STATS_CACHE_VERSION_KEY, 0)
+
+
+def invalidate_department_stats_cache():
+    """Move department statistics readers to a new cache version."""
+    _bump_cache_version(DEPARTMENT_STATS_CACHE_VERSION_KEY)
+
+
 class Department(models.Model):
     """
     Department model for organizational structure.
@@ -117,6 +168,8 @@ class Department(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = EmployeeCountQuerySet.as_manager()
+    
     class Meta:
         db_table = 'departments'
         verbose_name = 'Department'
@@ -130,10 +183,42 @@ class Department(models.Model):
     def __str__(self):
         return f"{self.name} ({self.code})"
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_department_list_cache()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_department_list_cache()
+        return result
+    
     @property
     def employee_count(self):
-        """Return the number of employees in this department."""
-        return self.employees.filter(is_active=True).count()
+        """
+        Return the number of employees in this department.
+        
+        Uses the with_employee_count() annotation when present.
+        """
+        count = getattr(self, 'active_employee_count', None)
+        if count is None:
+            count = self.employees.filter(is_active=True).count()
+        return count
+
+
+def _allocate_employee_ids(count):
+    """
+    Reserve count employee IDs from the employee_id_seq database sequence.
+    
+    Numbers come from a sequence so concurrent hires never receive the same ID.
+    """
+    if count <= 0:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval('employee_id_seq') FROM generate_series(1, %s)",
+            [count]
+        )
+        return [f"EMP{row[0]:04d}" for row in cursor.fetchall()]
 
 
 class EmployeeProfile(models.Model):
@@ -253,9 +338,10 @@ class EmployeeProfile(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     
     # Azure AD sync tracking for employee-specific data
-    azure_ad_group_memberships = models.TextField(
+    azure_ad_group_memberships = models.JSONField(
+        default=list,
         blank=True,
-        help_text='JSON list of Azure AD group memberships for this employee'
+        help_text='List of Azure AD group memberships for this employee'
     )
     azure_ad_manager_sync_status = models.CharField(
         max_length=20,
@@ -285,10 +371,31 @@ class EmployeeProfile(models.Model):
         verbose_name = 'Employee Profile'
         verbose_name_plural = 'Employee Profiles'
         indexes = [
-            models.Index(fields=['employee_id']),
-            models.Index(fields=['department', 'is_active']),
+            # Employee lookups by department almost always want active rows only
+            models.Index(
+                fields=['department'],
+                condition=models.Q(is_active=True),
+                name='emp_active_dept_idx'
+            ),
+            # Serves direct_reports and the hiring-manager pending_reviews filter
+            models.Index(
+                fields=['manager'],
+                condition=models.Q(is_active=True),
+                name='emp_active_mgr_idx'
+            ),
             models.Index(fields=['employment_status']),
             models.Index(fields=['hire_date']),
+            # Trigram index serving skills__icontains (UPPER(skills) LIKE ...)
+            GinIndex(
+                OpClass(Upper('skills'), name='gin_trgm_ops'),
+                name='emp_skills_trgm_idx'
+            ),
+            # Serves azure_ad_group_memberships__contains=[...] lookups
+            GinIndex(
+                fields=['azure_ad_group_memberships'],
+                opclasses=['jsonb_path_ops'],
+                name='emp_aad_groups_gin'
+            ),
         ]
     
     def __str__(self):
@@ -310,20 +417,45 @@ class EmployeeProfile(models.Model):
     def save(self, *args, **kwargs):
         """Override save to auto-generate employee ID if not provided."""
         if not self.employee_id:
-            # Generate employee ID based on department and sequence
-            last_emp = EmployeeProfile.objects.filter(
-                employee_id__startswith='EMP'
-            ).order_by('-employee_id').first()
-            
-            if last_emp:
-                last_num = int(last_emp.employee_id[3:])
-                new_num = last_num + 1
-            else:
-                new_num = 1001
-            
-            self.employee_id = f"EMP{new_num:04d}"
+            self.employee_id = _allocate_employee_ids(1)[0]
         
         super().save(*args, **kwargs)
+        # Department listings and statistics include employee counts
+        invalidate_department_list_cache()
+        invalidate_department_stats_cache()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_department_list_cache()
+        invalidate_department_stats_cache()
+        return result
+    
+    @classmethod
+    def bulk_onboard(cls, profiles, batch_size=1000):
+        """
+        Insert many employee profiles at once.
+        
+        Employee IDs for profiles without one are reserved from the sequence in
+        a single query, and rows are written with bulk_create, so save() and
+        its per-row ID lookup are skipped.
+        
+        Args:
+            profiles: Unsaved EmployeeProfile instances
+            batch_size: Number of rows per INSERT statement
+        
+        Returns:
+            List of created EmployeeProfile instances
+        """
+        profiles = list(profiles)
+        missing_ids = [profile for profile in profiles if not profile.employee_id]
+        
+        with transaction.atomic():
+            for profile, employee_id in zip(missing_ids, _allocate_employee_ids(len(missing_ids))):
+                profile.employee_id = employee_id
+            created = cls.objects.bulk_create(profiles, batch_size=batch_size)
+        invalidate_department_list_cache()
+        invalidate_department_stats_cache()
+        return created
 
 
 class PerformanceReview(models.Model):
@@ -423,7 +555,7 @@ class TimeOffRequest(models.Model):
     )
     start_date = models.DateField()
     end_date = models.DateField()
-    total_days = models.PositiveIntegerField()
+    total_days = models.PositiveSmallIntegerField()
     reason = models.TextField(blank=True)
     status = models.CharField(
         max_length=20,
@@ -448,7 +580,7 @@ class TimeOffRequest(models.Model):
         verbose_name_plural = 'Time Off Requests'
         indexes = [
             models.Index(fields=['employee', 'status']),
-            models.Index(fields=['start_date', 'end_date']),
+            models.Index(fields=['employee', 'start_date', 'end_date'], name='tor_emp_dates_idx'),
             models.Index(fields=['status']),
         ]
     
@@ -456,7 +588,27 @@ class TimeOffRequest(models.Model):
         return f"{self.employee.user.get_full_name()} - {self.request_type} ({self.start_date} to {self.end_date})"
     
     def save(self, *args, **kwargs):
-        """Calculate total days when saving."""
-        if self.start_date and self.end_date:
+        """
+        Calculate total days when saving.
+        
+        Partial saves only recompute total_days when a date is being written,
+        and then persist it alongside the dates.
+        """
+        update_fields = kwargs.get('update_fields')
+        recompute_days = True
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            recompute_days = bool(update_fields & {'start_date', 'end_date'})
+            if recompute_days:
+                kwargs['update_fields'] = update_fields | {'total_days'}
+        
+        if recompute_days and self.start_date and self.end_date:
             self.total_days = (self.end_date - self.start_date).days + 1
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+        # Department statistics include pending request counts
+        invalidate_department_stats_cache()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_department_stats_cache()
+        return result
\ No newline at end of file
@@ -8,9 +8,20 @@ including profiles, departments, performance reviews, and time-off requests.
 from rest_framework import serializers
 from django.utils import timezone
 from accounts.serializers import UserListSerializer
+from .managers import full_name_expression
 from .models import Department, EmployeeProfile, PerformanceReview, TimeOffRequest
 
 
+_EMPLOYMENT_STATUS_DISPLAY = dict(EmployeeProfile.EmploymentStatus.choices)
+_REVIEW_TYPE_DISPLAY = dict(PerformanceReview.ReviewType.choices)
+_RATING_DISPLAY = dict(PerformanceReview.Rating.choices)
+_REQUEST_TYPE_DISPLAY = dict(TimeOffRequest.RequestType.choices)
+_TIME_OFF_STATUS_DISPLAY = dict(TimeOffRequest.Status.choices)
+
+# TimeOffRequest.total_days is stored as a smallint
+_MAX_TIME_OFF_DAYS = 32767
+
+
 class DepartmentSerializer(serializers.ModelSerializer):
     """
     Serializer for Department model.
@@ -31,6 +42,13 @@ class DepartmentSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'employee_count']
     
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the related rows this serializer reads."""
+        return queryset.with_employee_count().select_related(
+            'manager', 'parent_department'
+        )
+    
     def validate_code(self, value):
         """Validate department code format."""
         if not value.isupper():
@@ -52,11 +70,18 @@ class DepartmentListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'code', 'manager_name', 'employee_count', 'is_active'
         ]
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the related rows this serializer reads."""
+        return queryset.with_employee_count().select_related('manager')
 
 
 class EmployeeProfileSerializer(serializers.ModelSerializer):
     """
     Serializer for EmployeeProfile model.
+    
+    Querysets should be passed through setup_eager_loading().
     """
     user_email = serializers.CharField(source='user.email', read_only=True)
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
@@ -82,6 +107,11 @@ class EmployeeProfileSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
     
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the related rows this serializer reads."""
+        return queryset.select_related('user', 'department', 'manager')
+    
     def validate(self, attrs):
         """Validate employment dates and manager assignment."""
         hire_date = attrs.get('hire_date')
@@ -102,10 +132,15 @@ class EmployeeProfileSerializer(serializers.ModelSerializer):
         # Validate manager assignment (manager should be in same or parent department)
         manager = attrs.get('manager')
         department = attrs.get('department')
-        if manager and department:
-            if not (manager.is_hr_manager or manager.is_admin or 
-                   manager.employee_profile.department == department or
-                   manager.employee_profile.department == department.parent_department):
+        if manager and department and not (manager.is_hr_manager or manager.is_admin):
+            # Compare department ids from a single lookup; managers without
+            # a profile fail the check instead of raising
+            manager_department_id = EmployeeProfile.objects.filter(
+                user_id=manager.pk
+            ).values_list('department_id', flat=True).first()
+            if manager_department_id is None or manager_department_id not in (
+                department.pk, department.parent_department_id
+            ):
                 raise serializers.ValidationError({
                     'manager': 'Manager must be in the same department, parent department, or be an HR manager/admin.'
                 })
@@ -116,14 +151,15 @@ class EmployeeProfileSerializer(serializers.ModelSerializer):
 class EmployeeListSerializer(serializers.ModelSerializer):
     """
     Simplified serializer for employee listings.
+    
+    Querysets should be passed through setup_eager_loading(), or at least
+    select_related('user', 'department'). A user_full_name annotation, when
+    present, is used instead of User.get_full_name().
     """
-    user_name = serializers.CharField(source='user.get_full_name', read_only=True)
+    user_name = serializers.SerializerMethodField()
     user_email = serializers.CharField(source='user.email', read_only=True)
     department_name = serializers.CharField(source='department.name', read_only=True)
-    employment_status_display = serializers.CharField(
-        source='get_employment_status_display', 
-        read_only=True
-    )
+    employment_status_display = serializers.SerializerMethodField()
     
     class Meta:
         model = EmployeeProfile
@@ -132,28 +168,36 @@ class EmployeeListSerializer(serializers.ModelSerializer):
             'department_name', 'employment_status', 'employment_status_display',
             'hire_date', 'is_active'
         ]
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Load only the columns this serializer reads."""
+        return queryset.select_related('user', 'department').only(
+            'id', 'employee_id', 'user__email', 'job_title',
+            'department__name', 'employment_status', 'hire_date', 'is_active'
+        ).annotate(user_full_name=full_name_expression('user'))
+    
+    def get_user_name(self, obj):
+        full_name = getattr(obj, 'user_full_name', None)
+        if full_name is None:
+            full_name = obj.user.get_full_name()
+        return full_name
+    
+    def get_employment_status_display(self, obj):
+        return _EMPLOYMENT_STATUS_DISPLAY.get(obj.employment_status, obj.employment_status)
 
 
 class PerformanceReviewSerializer(serializers.ModelSerializer):
     """
     Serializer for PerformanceReview model.
+    
+    Querysets should be passed through setup_eager_loading(), or annotate
+    employee_full_name and reviewer_full_name.
     """
-    employee_name = serializers.CharField(
-        source='employee.user.get_full_name', 
-        read_only=True
-    )
-    reviewer_name = serializers.CharField(
-        source='reviewer.get_full_name', 
-        read_only=True
-    )
-    review_type_display = serializers.CharField(
-        source='get_review_type_display', 
-        read_only=True
-    )
-    overall_rating_display = serializers.CharField(
-        source='get_overall_rating_display', 
-        read_only=True
-    )
+    employee_name = serializers.SerializerMethodField()
+    reviewer_name = serializers.SerializerMethodField()
+    review_type_display = serializers.SerializerMethodField()
+    overall_rating_display = serializers.SerializerMethodField()
     
     class Meta:
         model = PerformanceReview
@@ -167,6 +211,29 @@ class PerformanceReviewSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
     
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the related rows this serializer reads."""
+        return queryset.select_related('employee__user', 'reviewer')
+    
+    def get_employee_name(self, obj):
+        full_name = getattr(obj, 'employee_full_name', None)
+        if full_name is None:
+            full_name = obj.employee.user.get_full_name()
+        return full_name
+    
+    def get_reviewer_name(self, obj):
+        full_name = getattr(obj, 'reviewer_full_name', None)
+        if full_name is None:
+            full_name = obj.reviewer.get_full_name()
+        return full_name
+    
+    def get_review_type_display(self, obj):
+        return _REVIEW_TYPE_DISPLAY.get(obj.review_type, obj.review_type)
+    
+    def get_overall_rating_display(self, obj):
+        return _RATING_DISPLAY.get(obj.overall_rating, obj.overall_rating)
+    
     def validate(self, attrs):
         """Validate review period dates."""
         start_date = attrs.get('review_period_start')
@@ -183,8 +250,9 @@ class PerformanceReviewSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         
         if request and reviewer and employee:
+            # Compare the manager FK column so the manager row is not loaded
             if not (reviewer.is_admin or reviewer.is_hr_manager or
-                   employee.manager == reviewer):
+                   employee.manager_id == reviewer.pk):
                 raise serializers.ValidationError({
                     'reviewer': 'Reviewer must be the employee\'s manager, HR manager, or admin.'
                 })
@@ -192,22 +260,34 @@ class PerformanceReviewSerializer(serializers.ModelSerializer):
         return attrs
 
 
+
+class PerformanceReviewListSerializer(PerformanceReviewSerializer):
+    """
+    Performance review serializer for listings.
+    
+    Renders the same fields, but builds both names in the database.
+    """
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Annotate the names instead of loading a User per row."""
+        return queryset.annotate(
+            employee_full_name=full_name_expression('employee__user'),
+            reviewer_full_name=full_name_expression('reviewer')
+        )
+
 class TimeOffRequestSerializer(serializers.ModelSerializer):
     """
     Serializer for TimeOffRequest model.
+    
+    Querysets should be passed through setup_eager_loading().
     """
     employee_name = serializers.CharField(
         source='employee.user.get_full_name', 
         read_only=True
     )
-    request_type_display = serializers.CharField(
-        source='get_request_type_display', 
-        read_only=True
-    )
-    status_display = serializers.CharField(
-        source='get_status_display', 
-        read_only=True
-    )
+    request_type_display = serializers.SerializerMethodField()
+    status_display = serializers.SerializerMethodField()
     approved_by_name = serializers.CharField(
         source='approved_by.get_full_name', 
         read_only=True
@@ -227,6 +307,17 @@ class TimeOffRequestSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
     
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the related rows this serializer reads."""
+        return queryset.select_related('employee__user', 'approved_by')
+    
+    def get_request_type_display(self, obj):
+        return _REQUEST_TYPE_DISPLAY.get(obj.request_type, obj.request_type)
+    
+    def get_status_display(self, obj):
+        return _TIME_OFF_STATUS_DISPLAY.get(obj.status, obj.status)
+    
     def validate(self, attrs):
         """Validate time-off request dates."""
         start_date = attrs.get('start_date')
@@ -238,6 +329,11 @@ class TimeOffRequestSerializer(serializers.ModelSerializer):
                     'end_date': 'End date must be after or equal to start date.'
                 })
             
+            if (end_date - start_date).days + 1 > _MAX_TIME_OFF_DAYS:
+                raise serializers.ValidationError({
+                    'end_date': f'Time-off requests cannot exceed {_MAX_TIME_OFF_DAYS} days.'
+                })
+            
             # Validate start date is not in the past (except for sick leave)
             request_type = attrs.get('request_type')
             if (request_type != TimeOffRequest.RequestType.SICK and 
@@ -267,23 +363,37 @@ class TimeOffRequestSerializer(serializers.ModelSerializer):
 class TimeOffRequestListSerializer(serializers.ModelSerializer):
     """
     Simplified serializer for time-off request listings.
+    
+    Querysets should be passed through setup_eager_loading(), or at least
+    select_related('employee__user').
     """
-    employee_name = serializers.CharField(
-        source='employee.user.get_full_name', 
-        read_only=True
-    )
-    request_type_display = serializers.CharField(
-        source='get_request_type_display', 
-        read_only=True
-    )
-    status_display = serializers.CharField(
-        source='get_status_display', 
-        read_only=True
-    )
+    employee_name = serializers.SerializerMethodField()
+    request_type_display = serializers.SerializerMethodField()
+    status_display = serializers.SerializerMethodField()
     
     class Meta:
         model = TimeOffRequest
         fields = [
             'id', 'employee_name', 'request_type_display', 'start_date',
             'end_date', 'total_days', 'status', 'status_display', 'created_at'
-        ]
\ No newline at end of file
+        ]
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Load only the columns this serializer reads."""
+        return queryset.only(
+            'id', 'request_type', 'start_date', 'end_date', 'total_days',
+            'status', 'created_at'
+        ).annotate(employee_full_name=full_name_expression('employee__user'))
+    
+    def get_employee_name(self, obj):
+        full_name = getattr(obj, 'employee_full_name', None)
+        if full_name is None:
+            full_name = obj.employee.user.get_full_name()
+        return full_name
+    
+    def get_request_type_display(self, obj):
+        return _REQUEST_TYPE_DISPLAY.get(obj.request_type, obj.request_type)
+    
+    def get_status_display(self, obj):
+        return _TIME_OFF_STATUS_DISPLAY.get(obj.status, obj.status)
\ No newline at end of file
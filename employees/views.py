@@ -5,10 +5,17 @@ This module contains Django REST Framework views for handling employee-related
 operations including profiles, departments, performance reviews, and time-off requests.
 """
 
+import hashlib
+
 from rest_framework import viewsets, generics, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q, Count, Avg
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import (
+    Q, F, Value, Count, Max, Sum, DateField, DurationField, ExpressionWrapper
+)
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
@@ -19,19 +26,66 @@ from accounts.permissions import (
     IsOwnerOrManagerOrAdmin,
     DepartmentBasedPermission
 )
-from .models import Department, EmployeeProfile, PerformanceReview, TimeOffRequest
+from .models import (
+    Department,
+    EmployeeProfile,
+    PerformanceReview,
+    TimeOffRequest,
+    DEPARTMENT_LIST_CACHE_TIMEOUT,
+    DEPARTMENT_STATS_CACHE_TIMEOUT,
+    department_list_cache_version,
+    department_stats_cache_version,
+    invalidate_department_stats_cache,
+)
 from .serializers import (
     DepartmentSerializer,
     DepartmentListSerializer,
     EmployeeProfileSerializer,
     EmployeeListSerializer,
     PerformanceReviewSerializer,
+    PerformanceReviewListSerializer,
     TimeOffRequestSerializer,
     TimeOffRequestListSerializer
 )
 
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+def get_employee_profile_ids(request):
+    """
+    Return (employee profile id, department id) for the requesting user.
+    
+    Returns None when the user has no employee profile. Only the two columns
+    are read, and the result is memoised on the request so role filtering
+    looks the profile up at most once.
+    """
+    try:
+        return request._employee_profile_ids
+    except AttributeError:
+        pass
+    
+    profile_ids = EmployeeProfile.objects.filter(
+        user_id=request.user.pk
+    ).values_list('id', 'department_id').first()
+    request._employee_profile_ids = profile_ids
+    return profile_ids
+
+
+class EagerLoadingMixin:
+    """
+    Apply the serializer's setup_eager_loading() to the viewset queryset.
+    
+    Each serializer declares the related rows it reads, so list and detail
+    actions load exactly what their serializer needs.
+    """
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        setup_eager_loading = getattr(self.get_serializer_class(), 'setup_eager_loading', None)
+        if setup_eager_loading is not None:
+            queryset = setup_eager_loading(queryset)
+        return queryset
+
+
+class DepartmentViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing departments.
     """
@@ -51,7 +105,7 @@ class DepartmentViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter departments based on user role."""
         user = self.request.user
-        queryset = Department.objects.select_related('manager', 'parent_department')
+        queryset = super().get_queryset()
         
         if user.is_admin or user.is_hr_manager:
             return queryset
@@ -63,46 +117,91 @@ class DepartmentViewSet(viewsets.ModelViewSet):
             )
         else:
             # Employees can only see their own department
-            if hasattr(user, 'employee_profile'):
-                return queryset.filter(id=user.employee_profile.department.id)
+            profile_ids = get_employee_profile_ids(self.request)
+            if profile_ids:
+                return queryset.filter(id=profile_ids[1])
             return queryset.none()
     
+    def list(self, request, *args, **kwargs):
+        """
+        List departments, serving repeated requests from the cache.
+        
+        The key covers the full URL and the caller's visibility scope, and
+        embeds the department list version so writes invalidate it.
+        """
+        user = request.user
+        scope = 'all' if (user.is_admin or user.is_hr_manager) else f'user:{user.pk}'
+        url_hash = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+        cache_key = f"departments:list:{department_list_cache_version()}:{scope}:{url_hash}"
+        
+        data = cache.get(cache_key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.add(cache_key, data, DEPARTMENT_LIST_CACHE_TIMEOUT)
+        return Response(data)
+    
     @action(detail=True, methods=['get'])
     def employees(self, request, pk=None):
         """Get employees in a specific department."""
         department = self.get_object()
-        employees = EmployeeProfile.objects.filter(
-            department=department,
-            is_active=True
-        ).select_related('user', 'manager')
+        employees = EmployeeListSerializer.setup_eager_loading(
+            EmployeeProfile.objects.filter(department=department, is_active=True)
+        )
         
         serializer = EmployeeListSerializer(employees, many=True)
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
     def stats(self, request, pk=None):
-        """Get department statistics."""
+        """
+        Get department statistics.
+        
+        Results are cached under a version that employee profile and time-off
+        request writes bump.
+        """
         department = self.get_object()
         
+        cache_key = f"departments:stats:{department_stats_cache_version()}:{department.pk}"
+        stats = cache.get(cache_key)
+        if stats is None:
+            stats = self._compute_stats(department)
+            cache.add(cache_key, stats, DEPARTMENT_STATS_CACHE_TIMEOUT)
+        
+        return Response(stats)
+    
+    def _compute_stats(self, department):
+        """Compute the statistics returned by the stats action."""
+        today = timezone.now().date()
+        active = Q(is_active=True)
+        # Matches EmployeeProfile.tenure_days
+        tenure = ExpressionWrapper(
+            Coalesce('termination_date', Value(today), output_field=DateField()) - F('hire_date'),
+            output_field=DurationField()
+        )
+        
+        # Status breakdown, active headcount and tenure totals in one query
+        status_rows = department.employees.values('employment_status').annotate(
+            count=Count('id'),
+            active_count=Count('id', filter=active),
+            active_tenure=Sum(tenure, filter=active)
+        )
+        
         stats = {
-            'total_employees': department.employees.filter(is_active=True).count(),
+            'total_employees': 0,
             'employment_status_breakdown': {},
             'average_tenure_days': 0,
             'pending_time_off_requests': 0
         }
-        
-        # Employment status breakdown
-        status_counts = department.employees.values('employment_status').annotate(
-            count=Count('id')
-        )
-        for item in status_counts:
+        total_tenure_days = 0
+        for item in status_rows:
             stats['employment_status_breakdown'][item['employment_status']] = item['count']
+            stats['total_employees'] += item['active_count']
+            if item['active_tenure'] is not None:
+                total_tenure_days += item['active_tenure'].total_seconds() / 86400
         
         # Average tenure
-        avg_tenure = department.employees.filter(is_active=True).aggregate(
-            avg_tenure=Avg('tenure_days')
-        )
-        stats['average_tenure_days'] = avg_tenure['avg_tenure'] or 0
+        if stats['total_employees']:
+            stats['average_tenure_days'] = total_tenure_days / stats['total_employees']
         
         # Pending time-off requests
         stats['pending_time_off_requests'] = TimeOffRequest.objects.filter(
@@ -110,19 +209,25 @@ class DepartmentViewSet(viewsets.ModelViewSet):
             status=TimeOffRequest.Status.PENDING
         ).count()
         
-        return Response(stats)
+        return stats
 
 
-class EmployeeProfileViewSet(viewsets.ModelViewSet):
+class EmployeeProfileViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing employee profiles.
     """
+    queryset = EmployeeProfile.objects.all()
     permission_classes = [permissions.IsAuthenticated, DepartmentBasedPermission]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = [
-        'department', 'employment_status', 'employment_type', 
-        'manager', 'is_active'
-    ]
+    filterset_fields = {
+        'department': ['exact'],
+        'employment_status': ['exact'],
+        'employment_type': ['exact'],
+        'manager': ['exact'],
+        'is_active': ['exact'],
+        # ?skills__icontains=python is served by the skills trigram index
+        'skills': ['icontains'],
+    }
     search_fields = [
         'user__first_name', 'user__last_name', 'user__email',
         'employee_id', 'job_title', 'skills'
@@ -141,21 +246,21 @@ class EmployeeProfileViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter employees based on user role and department."""
         user = self.request.user
-        queryset = EmployeeProfile.objects.select_related(
-            'user', 'department', 'manager'
-        )
+        queryset = super().get_queryset()
         
         if user.is_admin or user.is_hr_manager:
             return queryset
         elif user.is_hiring_manager:
             # Hiring managers can see employees in their department
-            if hasattr(user, 'employee_profile'):
-                return queryset.filter(department=user.employee_profile.department)
+            profile_ids = get_employee_profile_ids(self.request)
+            if profile_ids:
+                return queryset.filter(department_id=profile_ids[1])
             return queryset.none()
         else:
             # Employees can only see their own profile
-            if hasattr(user, 'employee_profile'):
-                return queryset.filter(id=user.employee_profile.id)
+            profile_ids = get_employee_profile_ids(self.request)
+            if profile_ids:
+                return queryset.filter(id=profile_ids[0])
             return queryset.none()
     
     @action(detail=False, methods=['get'])
@@ -179,10 +284,9 @@ class EmployeeProfileViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        reports = EmployeeProfile.objects.filter(
-            manager=employee.user,
-            is_active=True
-        ).select_related('user', 'department')
+        reports = EmployeeListSerializer.setup_eager_loading(
+            EmployeeProfile.objects.filter(manager=employee.user, is_active=True)
+        )
         
         serializer = EmployeeListSerializer(reports, many=True)
         return Response(serializer.data)
@@ -193,7 +297,7 @@ class EmployeeProfileViewSet(viewsets.ModelViewSet):
         employee = self.get_object()
         reviews = PerformanceReview.objects.filter(
             employee=employee
-        ).select_related('reviewer').order_by('-review_period_end')
+        ).select_related('employee__user', 'reviewer').order_by('-review_period_end')
         
         serializer = PerformanceReviewSerializer(reviews, many=True)
         return Response(serializer.data)
@@ -204,49 +308,53 @@ class EmployeeProfileViewSet(viewsets.ModelViewSet):
         employee = self.get_object()
         current_year = timezone.now().year
         
-        time_off_data = {
-            'current_year_requests': TimeOffRequest.objects.filter(
-                employee=employee,
-                start_date__year=current_year
-            ).count(),
-            'approved_days_current_year': sum([
-                req.total_days for req in TimeOffRequest.objects.filter(
-                    employee=employee,
+        today = timezone.now().date()
+        requests = TimeOffRequest.objects.filter(employee=employee)
+        
+        # Counters and the approved-day total come from one aggregate query
+        time_off_data = requests.aggregate(
+            current_year_requests=Count('id', filter=Q(start_date__year=current_year)),
+            approved_days_current_year=Coalesce(
+                Sum('total_days', filter=Q(
                     start_date__year=current_year,
                     status=TimeOffRequest.Status.APPROVED
-                )
-            ]),
-            'pending_requests': TimeOffRequest.objects.filter(
-                employee=employee,
-                status=TimeOffRequest.Status.PENDING
-            ).count(),
-            'upcoming_time_off': TimeOffRequest.objects.filter(
-                employee=employee,
+                )),
+                0
+            ),
+            pending_requests=Count('id', filter=Q(status=TimeOffRequest.Status.PENDING))
+        )
+        time_off_data['upcoming_time_off'] = list(
+            requests.filter(
                 status=TimeOffRequest.Status.APPROVED,
-                start_date__gte=timezone.now().date()
-            ).order_by('start_date')[:5]
-        }
+                start_date__gte=today
+            ).order_by('start_date').values(
+                'id', 'request_type', 'start_date', 'end_date', 'total_days'
+            )[:5]
+        )
         
         return Response(time_off_data)
 
 
-class PerformanceReviewViewSet(viewsets.ModelViewSet):
+class PerformanceReviewViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing performance reviews.
     """
-    serializer_class = PerformanceReviewSerializer
+    queryset = PerformanceReview.objects.all()
     permission_classes = [IsManagerOrAdmin]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['employee', 'reviewer', 'review_type', 'is_final']
     ordering_fields = ['review_period_end', 'created_at']
     ordering = ['-review_period_end']
     
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return PerformanceReviewListSerializer
+        return PerformanceReviewSerializer
+    
     def get_queryset(self):
         """Filter reviews based on user role."""
         user = self.request.user
-        queryset = PerformanceReview.objects.select_related(
-            'employee__user', 'reviewer'
-        )
+        queryset = super().get_queryset()
         
         if user.is_admin or user.is_hr_manager:
             return queryset
@@ -257,17 +365,19 @@ class PerformanceReviewViewSet(viewsets.ModelViewSet):
             )
         else:
             # Employees can see their own reviews
-            if hasattr(user, 'employee_profile'):
-                return queryset.filter(employee=user.employee_profile)
+            profile_ids = get_employee_profile_ids(self.request)
+            if profile_ids:
+                return queryset.filter(employee_id=profile_ids[0])
             return queryset.none()
     
     @action(detail=False, methods=['get'])
     def my_reviews(self, request):
         """Get current user's performance reviews."""
-        if hasattr(request.user, 'employee_profile'):
+        profile_ids = get_employee_profile_ids(request)
+        if profile_ids:
             reviews = PerformanceReview.objects.filter(
-                employee=request.user.employee_profile
-            ).select_related('reviewer').order_by('-review_period_end')
+                employee_id=profile_ids[0]
+            ).select_related('employee__user', 'reviewer').order_by('-review_period_end')
             
             serializer = self.get_serializer(reviews, many=True)
             return Response(serializer.data)
@@ -291,11 +401,16 @@ class PerformanceReviewViewSet(viewsets.ModelViewSet):
         cutoff_date = timezone.now().date() - timezone.timedelta(days=90)
         recent_review_cutoff = timezone.now().date() - timezone.timedelta(days=365)
         
+        # The last review date comes from the same query as the employees
         employees_needing_review = EmployeeProfile.objects.filter(
             hire_date__lte=cutoff_date,
             is_active=True
         ).exclude(
             performance_reviews__review_period_end__gte=recent_review_cutoff
+        ).select_related('user', 'department').annotate(
+            last_review_date=Coalesce(
+                Max('performance_reviews__review_period_end'), 'hire_date'
+            )
         )
         
         if user.is_hiring_manager:
@@ -303,6 +418,13 @@ class PerformanceReviewViewSet(viewsets.ModelViewSet):
                 manager=user
             )
         
+        # Stream rows through a server-side cursor instead of caching every
+        # model instance on the queryset
+        employees_needing_review = employees_needing_review.only(
+            'id', 'hire_date', 'user__first_name', 'user__last_name', 'department__name'
+        ).iterator(chunk_size=1000)
+        
+        today = timezone.now().date()
         data = []
         for employee in employees_needing_review:
             data.append({
@@ -310,20 +432,17 @@ class PerformanceReviewViewSet(viewsets.ModelViewSet):
                 'employee_name': employee.user.get_full_name(),
                 'department': employee.department.name,
                 'hire_date': employee.hire_date,
-                'days_since_last_review': (
-                    timezone.now().date() - 
-                    (employee.performance_reviews.order_by('-review_period_end').first().review_period_end
-                     if employee.performance_reviews.exists() else employee.hire_date)
-                ).days
+                'days_since_last_review': (today - employee.last_review_date).days
             })
         
         return Response(data)
 
 
-class TimeOffRequestViewSet(viewsets.ModelViewSet):
+class TimeOffRequestViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing time-off requests.
     """
+    queryset = TimeOffRequest.objects.all()
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['employee', 'request_type', 'status']
@@ -338,9 +457,7 @@ class TimeOffRequestViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter time-off requests based on user role."""
         user = self.request.user
-        queryset = TimeOffRequest.objects.select_related(
-            'employee__user', 'approved_by'
-        )
+        queryset = super().get_queryset()
         
         if user.is_admin or user.is_hr_manager:
             return queryset
@@ -349,8 +466,9 @@ class TimeOffRequestViewSet(viewsets.ModelViewSet):
             return queryset.filter(employee__manager=user)
         else:
             # Employees can see only their own requests
-            if hasattr(user, 'employee_profile'):
-                return queryset.filter(employee=user.employee_profile)
+            profile_ids = get_employee_profile_ids(self.request)
+            if profile_ids:
+                return queryset.filter(employee_id=profile_ids[0])
             return queryset.none()
     
     def perform_create(self, serializer):
@@ -365,10 +483,11 @@ class TimeOffRequestViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def my_requests(self, request):
         """Get current user's time-off requests."""
-        if hasattr(request.user, 'employee_profile'):
+        profile_ids = get_employee_profile_ids(request)
+        if profile_ids:
             requests = TimeOffRequest.objects.filter(
-                employee=request.user.employee_profile
-            ).order_by('-created_at')
+                employee_id=profile_ids[0]
+            ).select_related('employee__user', 'approved_by').order_by('-created_at')
             
             serializer = self.get_serializer(requests, many=True)
             return Response(serializer.data)
@@ -388,9 +507,9 @@ class TimeOffRequestViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        queryset = TimeOffRequest.objects.filter(
-            status=TimeOffRequest.Status.PENDING
-        ).select_related('employee__user')
+        queryset = TimeOffRequestListSerializer.setup_eager_loading(
+            TimeOffRequest.objects.filter(status=TimeOffRequest.Status.PENDING)
+        )
         
         if user.is_hiring_manager:
             queryset = queryset.filter(employee__manager=user)
@@ -404,7 +523,7 @@ class TimeOffRequestViewSet(viewsets.ModelViewSet):
         time_off_request = self.get_object()
         
         if not (request.user.is_hr_manager or request.user.is_admin or
-                time_off_request.employee.manager == request.user):
+                time_off_request.employee.manager_id == request.user.pk):
             return Response(
                 {'error': 'Permission denied'}, 
                 status=status.HTTP_403_FORBIDDEN
@@ -419,18 +538,69 @@ class TimeOffRequestViewSet(viewsets.ModelViewSet):
         time_off_request.status = TimeOffRequest.Status.APPROVED
         time_off_request.approved_by = request.user
         time_off_request.approval_date = timezone.now()
-        time_off_request.save()
+        time_off_request.save(update_fields=['status', 'approved_by', 'approval_date', 'updated_at'])
         
         serializer = self.get_serializer(time_off_request)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['post'])
+    def bulk_approve(self, request):
+        """
+        Approve several pending time-off requests at once.
+        
+        Expects {"ids": [...]}. Requests outside the caller's scope or no
+        longer pending are reported as skipped; the rest are approved with a
+        single UPDATE.
+        """
+        user = request.user
+        if not (user.is_hiring_manager or user.is_hr_manager or user.is_admin):
+            return Response(
+                {'error': 'Permission denied'}, 
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        ids = request.data.get('ids')
+        try:
+            ids = {int(request_id) for request_id in ids} if isinstance(ids, list) else None
+        except (TypeError, ValueError):
+            ids = None
+        if not ids:
+            return Response(
+                {'error': 'ids must be a non-empty list of request IDs'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        now = timezone.now()
+        with transaction.atomic():
+            # get_queryset() limits hiring managers to their direct reports
+            approved_ids = list(
+                self.get_queryset().filter(
+                    id__in=ids,
+                    status=TimeOffRequest.Status.PENDING
+                ).select_for_update(of=('self',)).values_list('id', flat=True)
+            )
+            # update() skips auto_now, so updated_at is set explicitly
+            TimeOffRequest.objects.filter(id__in=approved_ids).update(
+                status=TimeOffRequest.Status.APPROVED,
+                approved_by=user,
+                approval_date=now,
+                updated_at=now
+            )
+        # update() bypasses save(), which normally invalidates these
+        invalidate_department_stats_cache()
+        
+        return Response({
+            'approved': sorted(approved_ids),
+            'skipped': sorted(ids.difference(approved_ids))
+        })
+    
     @action(detail=True, methods=['post'])
     def deny(self, request, pk=None):
         """Deny a time-off request."""
         time_off_request = self.get_object()
         
         if not (request.user.is_hr_manager or request.user.is_admin or
-                time_off_request.employee.manager == request.user):
+                time_off_request.employee.manager_id == request.user.pk):
             return Response(
                 {'error': 'Permission denied'}, 
                 status=status.HTTP_403_FORBIDDEN
@@ -448,7 +618,9 @@ class TimeOffRequestViewSet(viewsets.ModelViewSet):
         time_off_request.approved_by = request.user
         time_off_request.approval_date = timezone.now()
         time_off_request.denial_reason = denial_reason
-        time_off_request.save()
+        time_off_request.save(update_fields=[
+            'status', 'approved_by', 'approval_date', 'denial_reason', 'updated_at'
+        ])
         
         serializer = self.get_serializer(time_off_request)
         return Response(serializer.data)
\ No newline at end of file
@@ -3,9 +3,54 @@ Security middleware for enhanced security headers and protections.
 """
 
 from django.conf import settings
+from django.core.cache import cache
 from django.http import HttpResponse
+import logging
+import re
 import time
-from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+
+# Common attack patterns, matched case-insensitively as substrings; a space
+# matches any run of whitespace. The $suspicious_request map in nginx.conf and
+# nginx-ssl.conf is generated from this list by verify_proxy_scan_patterns.py.
+SUSPICIOUS_PATTERNS = [
+    'script>',
+    'javascript:',
+    'eval(',
+    'union select',
+    '../',
+    '..\\',
+    'cmd.exe',
+    '/etc/passwd',
+    'base64_decode'
+]
+_SUSPICIOUS_RE = re.compile('|'.join(
+    re.escape(pattern).replace(r'\ ', r'[ \t\n\r\f\v]+')
+    for pattern in SUSPICIOUS_PATTERNS
+))
+
+# Headers added to every response, built once at import
+CSP_DIRECTIVES = [
+    "default-src 'self'",
+    "script-src 'self' 'unsafe-inline'",
+    "style-src 'self' 'unsafe-inline'",
+    "img-src 'self' data:",
+    "font-src 'self'",
+    "connect-src 'self'",
+    "frame-ancestors 'none'",
+    "base-uri 'self'",
+    "form-action 'self'"
+]
+SECURITY_HEADERS = {
+    'X-Content-Type-Options': 'nosniff',
+    'X-Frame-Options': 'DENY',
+    'X-XSS-Protection': '1; mode=block',
+    'Referrer-Policy': 'strict-origin-when-cross-origin',
+    'Content-Security-Policy': '; '.join(CSP_DIRECTIVES),
+}
+HSTS_HEADER_VALUE = 'max-age=31536000; includeSubDomains; preload'
 
 
 class SecurityHeadersMiddleware:
@@ -15,33 +60,18 @@ class SecurityHeadersMiddleware:
     
     def __init__(self, get_response):
         self.get_response = get_response
+        # DEBUG does not change at runtime, so HSTS is decided once
+        self.hsts_enabled = not settings.DEBUG
 
     def __call__(self, request):
         response = self.get_response(request)
         
-        # Add security headers
-        response['X-Content-Type-Options'] = 'nosniff'
-        response['X-Frame-Options'] = 'DENY'
-        response['X-XSS-Protection'] = '1; mode=block'
-        response['Referrer-Policy'] = 'strict-origin-when-cross-origin'
-        
-        # Add CSP header
-        csp_directives = [
-            "default-src 'self'",
-            "script-src 'self' 'unsafe-inline'",
-            "style-src 'self' 'unsafe-inline'",
-            "img-src 'self' data:",
-            "font-src 'self'",
-            "connect-src 'self'",
-            "frame-ancestors 'none'",
-            "base-uri 'self'",
-            "form-action 'self'"
-        ]
-        response['Content-Security-Policy'] = '; '.join(csp_directives)
+        # Add security headers, including CSP
+        response.headers.update(SECURITY_HEADERS)
         
         # Add HSTS in production
-        if not settings.DEBUG and request.is_secure():
-            response['Strict-Transport-Security'] = 'max-age=31536000; includeSubDomains; preload'
+        if self.hsts_enabled and request.is_secure():
+            response['Strict-Transport-Security'] = HSTS_HEADER_VALUE
         
         return response
 
@@ -49,11 +79,13 @@ class SecurityHeadersMiddleware:
 class RateLimitMiddleware:
     """
     Simple rate limiting middleware for API endpoints.
+    
+    Counts requests per client IP in fixed windows stored in the shared
+    cache, so the limit holds across worker processes.
     """
     
     def __init__(self, get_response):
         self.get_response = get_response
-        self.requests = defaultdict(list)
         self.max_requests = 100  # requests per window
         self.window_size = 3600  # 1 hour in seconds
 
@@ -61,27 +93,40 @@ class RateLimitMiddleware:
         # Only apply rate limiting to API endpoints
         if request.path.startswith('/api/') or 'powerapps' in request.path:
             client_ip = self.get_client_ip(request)
-            current_time = time.time()
+            window = int(time.time()) // self.window_size
+            key = f"ratelimit:{client_ip}:{window}"
             
-            # Clean old requests
-            self.requests[client_ip] = [
-                req_time for req_time in self.requests[client_ip]
-                if current_time - req_time < self.window_size
-            ]
+            request_count = self.record_request(key)
             
             # Check rate limit
-            if len(self.requests[client_ip]) >= self.max_requests:
+            if request_count is not None and request_count > self.max_requests:
                 return HttpResponse(
                     'Rate limit exceeded. Try again later.',
                     status=429,
                     content_type='text/plain'
                 )
-            
-            # Record this request
-            self.requests[client_ip].append(current_time)
         
         return self.get_response(request)
     
+    def record_request(self, key):
+        """
+        Count a request in the window stored under key.
+        
+        Returns the new count, or None if the cache is unreachable so the
+        request is let through rather than failing.
+        """
+        try:
+            cache.add(key, 0, self.window_size)
+            try:
+                return cache.incr(key)
+            except ValueError:
+                # Counter expired between add() and incr()
+                cache.set(key, 1, self.window_size)
+                return 1
+        except Exception as e:
+            logger.warning(f"Rate limit cache unavailable, allowing request: {e}")
+            return None
+    
     def get_client_ip(self, request):
         """Get client IP address."""
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -95,14 +140,23 @@ class RateLimitMiddleware:
 class SecurityAuditMiddleware:
     """
     Middleware to log security events for monitoring.
+    
+    With SECURITY_PROXY_SCAN enabled the pattern matching is done by nginx,
+    which flags matching requests with an X-Suspicious-Request header.
     """
     
     def __init__(self, get_response):
         self.get_response = get_response
+        self.proxy_scan = getattr(settings, 'SECURITY_PROXY_SCAN', False)
 
     def __call__(self, request):
+        if self.proxy_scan:
+            suspicious = request.META.get('HTTP_X_SUSPICIOUS_REQUEST') == '1'
+        else:
+            suspicious = self.is_suspicious_request(request)
+        
         # Log suspicious activity
-        if self.is_suspicious_request(request):
+        if suspicious:
             import logging
             logger = logging.getLogger('security')
             logger.warning(f"Suspicious request detected: {request.path}", extra={
@@ -116,32 +170,15 @@ class SecurityAuditMiddleware:
     
     def is_suspicious_request(self, request):
         """Check for common attack patterns."""
-        suspicious_patterns = [
-            'script>',
-            'javascript:',
-            'eval(',
-            'union select',
-            '../',
-            '..\\',
-            'cmd.exe',
-            '/etc/passwd',
-            'base64_decode'
-        ]
-        
         # Check URL path
-        path_lower = request.path.lower()
-        for pattern in suspicious_patterns:
-            if pattern in path_lower:
-                return True
+        if _SUSPICIOUS_RE.search(request.path.lower()):
+            return True
         
         # Check query parameters
-        for value in request.GET.values():
-            value_lower = value.lower()
-            for pattern in suspicious_patterns:
-                if pattern in value_lower:
-                    return True
-        
-        return False
+        return any(
+            _SUSPICIOUS_RE.search(value.lower())
+            for value in request.GET.values()
+        )
     
     def get_client_ip(self, request):
         """Get client IP address."""
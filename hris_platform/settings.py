@@ -30,54 +30,49 @@ DEBUG = config('DEBUG', default=False, cast=bool)
 
 # Dynamic ALLOWED_HOSTS configuration
 import socket
-import subprocess
+import time
+
+SERVER_IP_CACHE_FILE = BASE_DIR / '.cache' / 'server_ip'
+SERVER_IP_CACHE_TTL = config('SERVER_IP_CACHE_TTL', default=3600, cast=int)
 
 def get_server_ip():
     """Get the server's IP address for ALLOWED_HOSTS (prioritize internal IP for self-hosted deployment)"""
     
-    # For self-hosted applications, prioritize internal/private IP addresses
+    # Reuse the address found by an earlier process while it is fresh
     try:
-        # Method 1: Socket method (gets internal IP used for outbound connections)
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        ip = s.getsockname()[0]
-        s.close()
-        # Prefer this internal IP for self-hosted deployments
-        return ip
-    except:
+        if time.time() - SERVER_IP_CACHE_FILE.stat().st_mtime < SERVER_IP_CACHE_TTL:
+            ip = SERVER_IP_CACHE_FILE.read_text().strip()
+            if ip:
+                return ip
+    except OSError:
         pass
     
     try:
-        # Method 2: Safer IP detection using socket connection
-        import socket
+        # Connecting a UDP socket sends nothing; it only picks the internal IP
+        # the kernel would use for outbound traffic
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
             s.connect(("8.8.8.8", 80))
-            return s.getsockname()[0]
-    except:
-        pass
+            ip = s.getsockname()[0]
+    except OSError:
+        return None
     
     try:
-        # Method 3: Only try external IP as last resort (for public deployments)
-        # Note: This is commented out to prioritize internal IPs for self-hosted tools
-        # Uncomment if you need external IP detection for public-facing deployments
-        # result = subprocess.run(['curl', '-s', '-4', 'ifconfig.me'], 
-        #                       capture_output=True, text=True, timeout=5)
-        # if result.returncode == 0 and result.stdout.strip():
-        #     return result.stdout.strip()
-        pass
-    except:
+        SERVER_IP_CACHE_FILE.parent.mkdir(exist_ok=True)
+        SERVER_IP_CACHE_FILE.write_text(ip)
+    except OSError:
         pass
     
-    return None
+    return ip
 
 # Base allowed hosts from environment
 allowed_hosts = config('ALLOWED_HOSTS', default='localhost,127.0.0.1,0.0.0.0').split(',')
 allowed_hosts = [host.strip() for host in allowed_hosts if host.strip()]
 
-# Add server IP if we can detect it
-server_ip = get_server_ip()
-if server_ip and server_ip not in allowed_hosts:
-    allowed_hosts.append(server_ip)
+# Add server IP if detection is enabled and the hosts list does not already allow everything
+if config('DETECT_SERVER_IP', default=False, cast=bool) and not DEBUG and '*' not in allowed_hosts:
+    server_ip = get_server_ip()
+    if server_ip and server_ip not in allowed_hosts:
+        allowed_hosts.append(server_ip)
 
 # Allow all hosts in DEBUG mode
 if DEBUG:
@@ -177,6 +172,10 @@ AUTH_PASSWORD_VALIDATORS = [
 # Custom user model
 AUTH_USER_MODEL = 'accounts.User'
 
+AUTHENTICATION_BACKENDS = [
+    'accounts.backends.SlimUserModelBackend',
+]
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -258,6 +257,14 @@ EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 
+# Shared cache, used for rate limiting and cross-process cached data
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('CACHE_URL', default='redis://localhost:6379/1'),
+    }
+}
+
 # Celery configuration for background tasks
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
@@ -266,6 +273,24 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Azure AD tasks run on their own queue so bulk syncs cannot starve other work.
+# Workers must consume it, e.g. "celery -A hris_platform worker -Q celery,azure_ad".
+CELERY_TASK_ROUTES = {
+    'accounts.tasks.sync_user_to_azure_ad': {'queue': 'azure_ad'},
+    'accounts.tasks.bulk_sync_users_to_azure_ad': {'queue': 'azure_ad'},
+    'accounts.tasks.sync_user_batch_to_azure_ad': {'queue': 'azure_ad'},
+    'accounts.tasks.sync_failed_users_retry': {'queue': 'azure_ad'},
+    'accounts.tasks.test_azure_ad_connection': {'queue': 'azure_ad'},
+}
+
+# Periodic tasks run by "celery -A hris_platform beat"
+CELERY_BEAT_SCHEDULE = {
+    'cleanup-expired-password-reset-tokens': {
+        'task': 'accounts.tasks.cleanup_expired_password_reset_tokens',
+        'schedule': timedelta(hours=1),
+    },
+}
+
 # Azure AD / Microsoft Graph API Configuration
 AZURE_AD_ENABLED = config('AZURE_AD_ENABLED', default=False, cast=bool)
 AZURE_AD_TENANT_ID = config('AZURE_AD_TENANT_ID', default='')
@@ -403,6 +428,10 @@ CSP_FONT_SRC = "'self'"
 CSP_CONNECT_SRC = "'self'"
 CSP_FRAME_ANCESTORS = "'none'"
 
+# Let the reverse proxy scan for suspicious requests (see nginx.conf); Django
+# then only logs requests flagged with the X-Suspicious-Request header
+SECURITY_PROXY_SCAN = config('SECURITY_PROXY_SCAN', default=False, cast=bool)
+
 # Rate Limiting Configuration
 RATELIMIT_ENABLE = True
 RATELIMIT_USE_CACHE = 'default'
\ No newline at end of file
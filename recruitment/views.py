@@ -30,6 +30,7 @@ from accounts.permissions import (
     IsCandidateOrAdmin
 )
 from .models import JobPosting, Applicant, Interview, JobOfferment, PowerAppsConfiguration
+from .tasks import notify_new_application
 from .serializers import (
     JobPostingSerializer,
     JobPostingListSerializer,
@@ -1017,29 +1018,15 @@ def powerapps_submission(request, api_key):
                 'operation_id': operation_id
             }, status=500)
         
-        # Send confirmation email if enabled
-        if config.auto_send_confirmation:
+        # Emails and the webhook are sent by a worker so the submission
+        # does not wait on SMTP or the webhook endpoint
+        if config.auto_send_confirmation or config.notification_emails or config.webhook_url:
             try:
-                send_application_confirmation_email(applicant, config)
-                logger.info(f"[{operation_id}] Confirmation email sent to: {applicant.email}")
+                notify_new_application.delay(applicant.id, config.id, operation_id)
+                logger.info(f"[{operation_id}] Application notifications queued")
             except Exception as e:
-                logger.warning(f"[{operation_id}] Failed to send confirmation email: {e}")
-        
-        # Send notification emails
-        if config.notification_emails:
-            try:
-                send_new_application_notification(applicant, config)
-                logger.info(f"[{operation_id}] Notification emails sent")
-            except Exception as e:
-                logger.warning(f"[{operation_id}] Failed to send notification emails: {e}")
-        
-        # Call webhook if configured
-        if config.webhook_url:
-            try:
-                call_webhook(config.webhook_url, applicant, operation_id)
-                logger.info(f"[{operation_id}] Webhook called successfully")
-            except Exception as e:
-                logger.warning(f"[{operation_id}] Webhook call failed: {e}")
+                # The application is saved; a broker outage only loses the notifications
+                logger.warning(f"[{operation_id}] Failed to queue application notifications: {e}")
         
         # Update configuration statistics
         config.increment_submission_count(successful=True)
@@ -1153,139 +1140,3 @@ def process_file_upload(file_data, max_size_mb, allowed_types, file_type):
     except Exception as e:
         raise ValueError(f"Failed to process {file_type} file: {e}")
 
-
-def send_application_confirmation_email(applicant, config):
-    """
-    Send confirmation email to applicant.
-    
-    Args:
-        applicant: Applicant instance
-        config: PowerAppsConfiguration instance
-    """
-    from django.core.mail import send_mail
-    from django.template import Template, Context
-    
-    try:
-        # Use custom template if provided, otherwise use default
-        if config.confirmation_email_template:
-            template = Template(config.confirmation_email_template)
-        else:
-            template = Template("""
-            Dear {{ applicant.first_name }},
-            
-            Thank you for your application for the {{ job_title }} position.
-            
-            We have received your application and our team will review it shortly.
-            You will hear from us within the next few business days.
-            
-            Application Details:
-            - Name: {{ applicant.full_name }}
-            - Email: {{ applicant.email }}
-            - Job: {{ job_title }}
-            - Submitted: {{ applicant.applied_at }}
-            
-            Best regards,
-            {{ company_name }} Recruitment Team
-            """)
-        
-        context = Context({
-            'applicant': applicant,
-            'job_title': applicant.job.title if applicant.job else 'Unknown Position',
-            'company_name': 'DANI HRIS'  # Could be configurable
-        })
-        
-        email_content = template.render(context)
-        
-        send_mail(
-            subject=f"Application Received - {applicant.job.title if applicant.job else 'Job Application'}",
-            message=email_content,
-            from_email=None,  # Use default from settings
-            recipient_list=[applicant.email],
-            fail_silently=False
-        )
-        
-    except Exception as e:
-        raise Exception(f"Failed to send confirmation email: {e}")
-
-
-def send_new_application_notification(applicant, config):
-    """
-    Send notification emails to HR team about new application.
-    
-    Args:
-        applicant: Applicant instance
-        config: PowerAppsConfiguration instance
-    """
-    from django.core.mail import send_mail
-    
-    try:
-        if not config.notification_emails:
-            return
-        
-        subject = f"New Application: {applicant.full_name} - {applicant.job.title if applicant.job else 'Unknown Position'}"
-        
-        message = f"""
-        A new job application has been received through PowerApps.
-        
-        Applicant Details:
-        - Name: {applicant.full_name}
-        - Email: {applicant.email}
-        - Phone: {applicant.phone}
-        - Position: {applicant.job.title if applicant.job else 'Unknown Position'}
-        - Source: {applicant.source}
-        - Submitted: {applicant.applied_at}
-        
-        Please log into the DANI HRIS system to review this application.
-        
-        Configuration: {config.name}
-        """
-        
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=None,  # Use default from settings
-            recipient_list=config.notification_emails,
-            fail_silently=False
-        )
-        
-    except Exception as e:
-        raise Exception(f"Failed to send notification emails: {e}")
-
-
-def call_webhook(webhook_url, applicant, operation_id):
-    """
-    Call configured webhook with application data.
-    
-    Args:
-        webhook_url: Webhook URL to call
-        applicant: Applicant instance
-        operation_id: Operation identifier for logging
-    """
-    import requests
-    
-    try:
-        webhook_data = {
-            'event': 'new_application',
-            'operation_id': operation_id,
-            'applicant': {
-                'id': applicant.id,
-                'name': applicant.full_name,
-                'email': applicant.email,
-                'phone': applicant.phone,
-                'job_title': applicant.job.title if applicant.job else None,
-                'source': applicant.source,
-                'applied_at': applicant.applied_at.isoformat()
-            }
-        }
-        
-        response = requests.post(
-            webhook_url,
-            json=webhook_data,
-            timeout=10,
-            headers={'Content-Type': 'application/json'}
-        )
-        
-        response.raise_for_status()
-        
-    except Exception as e:
-        raise Exception(f"Webhook call failed: {e}")
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Check that the nginx suspicious-request map matches SecurityAuditMiddleware.
+
+nginx matches the raw $request_uri, while the middleware matches the decoded
+path and query values. The map regex is therefore generated from
+SUSPICIOUS_PATTERNS so that every character may also appear percent-encoded,
+and this script checks that both sides flag the same sample requests.
+
+Usage:
+    python verify_proxy_scan_patterns.py          # verify nginx.conf and nginx-ssl.conf
+    python verify_proxy_scan_patterns.py --print  # print the regex for the map block
+"""
+
+import re
+import sys
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from hris_platform.security_middleware import SUSPICIOUS_PATTERNS, _SUSPICIOUS_RE
+
+BASE_DIR = Path(__file__).resolve().parent
+NGINX_CONFIGS = ['nginx.conf', 'nginx-ssl.conf']
+MAP_REGEX_RE = re.compile(r'"~\*(?P<regex>.*)" "1";')
+
+# Whitespace the middleware matches for a space, as it can appear in a raw URI
+ENCODED_WHITESPACE = r'(\+|%20|%09|%0a|%0b|%0c|%0d)+'
+
+SAMPLES = [
+    # Flagged
+    '/api/search/?q=<script>alert(1)</script>',
+    '/api/search/?q=%3Cscript%3Ealert(1)',
+    '/api/search/?q=%3cSCRIPT%3e',
+    '/api/search/?next=javascript:alert(1)',
+    '/api/search/?next=javascript%3aalert(1)',
+    '/api/search/?q=eval(1)',
+    '/api/search/?q=eval%281%29',
+    '/api/search/?q=1+UNION+SELECT+password',
+    '/api/search/?q=1%20union%20select',
+    '/api/search/?q=1%09union%0aselect',
+    '/api/search/?q=1+union%20%20select',
+    '/api/files/?path=../etc',
+    '/api/files/?path=%2e%2e%2fetc',
+    '/api/files/?path=.%2e/etc',
+    '/api/files/?path=%2e./etc',
+    '/api/files/?path=..%2fetc',
+    '/api/files/?path=..\\windows',
+    '/api/files/?path=.%2e%5cwindows',
+    '/static/%2e%2e/%2e%2e/settings.py',
+    '/api/run/?c=cmd.exe',
+    '/api/run/?c=cmd%2eexe',
+    '/api/run/?c=%63md.exe',
+    '/api/files/?path=/etc/passwd',
+    '/api/files/?path=%2Fetc%2Fpasswd',
+    '/api/run/?f=base64_decode',
+    '/api/run/?f=base64%5fdecode',
+    # Not flagged
+    '/',
+    '/api/employees/?page=2',
+    '/api/jobs/?search=javascript+developer',
+    '/api/reviews/?q=evaluation',
+    '/api/search/?q=union+station',
+    '/api/search/?q=selection',
+    '/api/files/?path=./reports/2026.pdf',
+    '/static/js/app.min.js',
+    '/api/run/?c=cmd',
+    '/api/files/?path=%2Fetc%2Fhosts',
+]
+
+
+def nginx_regex():
+    """Build the regex for the nginx map from SUSPICIOUS_PATTERNS."""
+    alternatives = []
+    for pattern in SUSPICIOUS_PATTERNS:
+        parts = []
+        for char in pattern:
+            if char == ' ':
+                parts.append(ENCODED_WHITESPACE)
+                continue
+            # nginx unescapes "\\" in quoted strings, so spell a backslash \x5c
+            literal = r'\x5c' if char == '\\' else re.escape(char)
+            parts.append(f'({literal}|%{ord(char):02x})')
+        alternatives.append(''.join(parts))
+    return '(' + '|'.join(alternatives) + ')'
+
+
+def django_flags(uri):
+    """Mirror SecurityAuditMiddleware.is_suspicious_request on a raw URI."""
+    parts = urlsplit(uri)
+    if _SUSPICIOUS_RE.search(unquote(parts.path).lower()):
+        return True
+    return any(
+        _SUSPICIOUS_RE.search(value.lower())
+        for _, value in parse_qsl(parts.query, keep_blank_values=True)
+    )
+
+
+def main():
+    expected = nginx_regex()
+    if '--print' in sys.argv:
+        print(expected)
+        return 0
+
+    errors = []
+    for name in NGINX_CONFIGS:
+        match = MAP_REGEX_RE.search((BASE_DIR / name).read_text())
+        if not match:
+            errors.append(f"{name}: $suspicious_request map not found")
+        elif match.group('regex') != expected:
+            errors.append(f"{name}: map regex is out of date, regenerate it with --print")
+
+    proxy_re = re.compile(expected, re.IGNORECASE)
+    for uri in SAMPLES:
+        django_result = django_flags(uri)
+        proxy_result = bool(proxy_re.search(uri))
+        if django_result != proxy_result:
+            errors.append(f"{uri}: middleware={django_result} nginx={proxy_result}")
+
+    for error in errors:
+        print(f"❌ {error}")
+    if errors:
+        return 1
+
+    print(f"✅ nginx map matches SUSPICIOUS_PATTERNS on {len(SAMPLES)} samples")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
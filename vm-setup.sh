@@ -69,6 +69,8 @@ if [ ! -f .env.example ]; then
 DEBUG=True
 SECRET_KEY=your-secret-key-here-change-in-production
 ALLOWED_HOSTS=localhost,127.0.0.1,0.0.0.0
+# Add this server's detected IP address to ALLOWED_HOSTS
+DETECT_SERVER_IP=True
 
 # Database Configuration
 DB_NAME=hris_platform
@@ -80,6 +82,7 @@ DB_PORT=5432
 # Redis/Celery Configuration
 CELERY_BROKER_URL=redis://redis:6380/0
 CELERY_RESULT_BACKEND=redis://redis:6380/0
+CACHE_URL=redis://redis:6380/1
 
 # Logging Configuration
 USE_FILE_LOGGING=true